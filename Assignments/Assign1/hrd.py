@@ -1,20 +1,78 @@
-from copy import deepcopy
-from heapq import heappush, heappop
+from heapq import heapify, heappush, heappop
+from operator import itemgetter
+from collections import OrderedDict
+from itertools import count
+from multiprocessing import Array, Pool, Process, Queue, Value
+from queue import Empty
 import time
 import argparse
+import json
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+from array import array
+from bisect import bisect_left
 import sys
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 #====================================================================================
 
 char_goal = '1'
 char_single = '2'
 
-class Piece:
+# Constants for the bit-packed board. Cell (x, y) is bit y * 4 + x.
+board_width = 4
+board_height = 5
+full_mask = (1 << (board_width * board_height)) - 1
+col_masks = [sum(1 << (y * board_width + x) for y in range(board_height)) \
+    for x in range(board_width)]
+not_left_mask = full_mask & ~col_masks[0]
+not_right_mask = full_mask & ~col_masks[3]
+goal_anchor = 3 * board_width + 1  # goal piece top left at (1, 3)
+goal_cells = 0x33  # bits of a 2x2 piece anchored at cell 0
+# The cells covered by each kind of piece anchored at cell 0.
+shape_masks = {char_goal: goal_cells, char_single: 1, 'h': 3, 'v': 1 | (1 << board_width)}
+# Distance table file format, see DistanceTable.
+table_magic = b'HRDTABLE'
+table_unsolvable = 0xffff
+# The step taken by a piece moving in each direction.
+directions = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+# A move code is the top left cell of the moved piece * 4 + the index of its
+# direction here, see encode_move().
+move_directions = list(directions)
+# reversed_rows[n] is the 4-bit row n read right to left
+reversed_rows = [int('{:04b}'.format(n)[::-1], 2) for n in range(16)]
+# Rendered board rows by the pieces they hold, filled in by render_key().
+row_strings = {}
+# Buffer size of solution files.
+output_buffer = 1 << 16
+# Number of nodes a parallel A* worker expands between checks of its inbox.
+hda_burst = 64
+# How much the weight of anytime A* drops after each solution.
+ara_weight_step = 0.5
+# Number of expansions between checks of the anytime A* time limit.
+ara_check_every = 256
+# The algorithms that always return an optimal solution, whose solutions go
+# into the solution cache. Every heuristic in heuristics is consistent, which
+# astar needs; ara and smastar may stop short of the optimum.
+cached_algos = ('astar', 'bibfs', 'ida', 'iddfs', 'hda')
+
+class Piece(tuple):
     """
     This represents a piece on the Hua Rong Dao puzzle.
+
+    Pieces are immutable tuples, so boards can share them; moving a piece
+    creates a new one.
     """
 
-    def __init__(self, is_goal, is_single, coord_x, coord_y, orientation):
+    __slots__ = ()
+
+    def __new__(cls, is_goal, is_single, coord_x, coord_y, orientation):
         """
         :param is_goal: True if the piece is the goal piece and False otherwise.
         :type is_goal: bool
@@ -29,11 +87,16 @@ class Piece:
         :type orientation: str
         """
 
-        self.is_goal = is_goal
-        self.is_single = is_single
-        self.coord_x = coord_x
-        self.coord_y = coord_y
-        self.orientation = orientation
+        return tuple.__new__(cls, (is_goal, is_single, coord_x, coord_y, orientation))
+
+    is_goal = property(itemgetter(0))
+    is_single = property(itemgetter(1))
+    coord_x = property(itemgetter(2))
+    coord_y = property(itemgetter(3))
+    orientation = property(itemgetter(4))
+
+    def __getnewargs__(self):
+        return tuple(self)
 
 
     def __repr__(self):
@@ -43,17 +106,49 @@ class Piece:
 
     def move(self, direction):
         """
-        Move the piece one step in the direction of the orientation.
+        Create the piece moved one step in a direction.
+
+        :param direction: One of 'up', 'down', 'left' or 'right'.
+        :type direction: str
+        :return: The moved piece.
+        :rtype: Piece
         """
-            
-        if direction == 'up':
-            self.coord_y -= 1
-        elif direction == 'down':
-            self.coord_y += 1
-        elif direction == 'left':
-            self.coord_x -= 1
-        elif direction == 'right':
-            self.coord_x += 1
+
+        dx, dy = directions[direction]
+        return Piece(self.is_goal, self.is_single, self.coord_x + dx, 
+            self.coord_y + dy, self.orientation)
+
+
+    def kind(self):
+        """
+        :return: The kind of the piece: char_goal, char_single, 'h' or 'v'.
+        :rtype: str
+        """
+
+        if self.is_goal:
+            return char_goal
+        if self.is_single:
+            return char_single
+        return self.orientation
+
+
+    def cells(self):
+        """
+        Find the cells covered by the piece.
+
+        :return: The x coordinate, y coordinate and symbol of each cell.
+        :rtype: List[Tuple[int, int, str]]
+        """
+
+        x, y = self.coord_x, self.coord_y
+        if self.is_goal:
+            return [(x, y, char_goal), (x + 1, y, char_goal), 
+                (x, y + 1, char_goal), (x + 1, y + 1, char_goal)]
+        if self.is_single:
+            return [(x, y, char_single)]
+        if self.orientation == 'h':
+            return [(x, y, '<'), (x + 1, y, '>')]
+        return [(x, y, '^'), (x, y + 1, 'v')]
 
 
 
@@ -63,22 +158,36 @@ class Board:
     Board class for setting up the playing board.
     """
 
-    def __init__(self, pieces):
+    __slots__ = ('pieces', 'grid', 'owner', 'empty')
+
+    width = board_width
+    height = board_height
+
+    def __init__(self, pieces, grid=None, owner=None, empty=None):
         """
         :param pieces: The list of Pieces
         :type pieces: List[Piece]
+        :param grid: A prebuilt grid for the pieces, see move_piece().
+        :type grid: Optional[List[str]]
+        :param owner: A prebuilt owner list for the pieces.
+        :type owner: Optional[List[Optional[int]]]
+        :param empty: The prebuilt list of empty cells.
+        :type empty: Optional[List[Tuple[int, int]]]
         """
 
-        self.width = 4
-        self.height = 5
-
         self.pieces = pieces
 
-        # self.grid is a 2-d (size * size) array automatically generated
+        # self.grid is a flat (y * width + x) array automatically generated
         # using the information on the pieces when a board is being created.
         # A grid contains the symbol for representing the pieces on the board.
-        self.grid = []
-        self.__construct_grid()
+        # self.owner is the flat list of the index of the piece covering 
+        # each cell, None for the empty cells in self.empty.
+        if grid is None:
+            self.__construct_grid()
+        else:
+            self.grid = grid
+            self.owner = owner
+            self.empty = empty
 
 
     def __construct_grid(self):
@@ -87,52 +196,34 @@ class Board:
 
         """
 
-        for i in range(self.height):
-            line = []
-            for j in range(self.width):
-                line.append('.')
-            self.grid.append(line)
+        self.grid = ['.'] * (self.width * self.height)
+        self.owner = [None] * (self.width * self.height)
 
 
         # print(self.pieces)
         # print('\n')
-        for piece in self.pieces:
-            if piece.is_goal:
-                self.grid[piece.coord_y][piece.coord_x] = char_goal
-                self.grid[piece.coord_y][piece.coord_x + 1] = char_goal
-                self.grid[piece.coord_y + 1][piece.coord_x] = char_goal
-                self.grid[piece.coord_y + 1][piece.coord_x + 1] = char_goal
-            elif piece.is_single:
-                self.grid[piece.coord_y][piece.coord_x] = char_single
-            else:
-                if piece.orientation == 'h':
-                    self.grid[piece.coord_y][piece.coord_x] = '<'
-                    self.grid[piece.coord_y][piece.coord_x + 1] = '>'
-                elif piece.orientation == 'v':
-                    self.grid[piece.coord_y][piece.coord_x] = '^'
-                    self.grid[piece.coord_y + 1][piece.coord_x] = 'v'
+        for ind, piece in enumerate(self.pieces):
+            for x, y, ch in piece.cells():
+                self.grid[y * self.width + x] = ch
+                self.owner[y * self.width + x] = ind
+
+        self.empty = [(x, y) for y in range(self.height) \
+            for x in range(self.width) if self.owner[y * self.width + x] is None]
 
     def display(self):
         """
         Print out the current board.
 
         """
-        for i, line in enumerate(self.grid):
-            for ch in line:
-                print(ch, end='')
-            print()
+        print(self.display_string())
 
     def display_string(self):
         """
         Return the current board as a string.
         """
-        s = ''
-        for i, line in enumerate(self.grid):
-            for ch in line:
-                s += ch
-            s += '\n'
-
-        return s[:-1]
+        w = self.width
+        return '\n'.join(''.join(self.grid[y * w:(y + 1) * w]) \
+            for y in range(self.height))
 
 
 
@@ -145,12 +236,7 @@ class Board:
         :rtype: list(Tuple[int, int])
         """
 
-        l = []
-        for i, line in enumerate(self.grid):
-            for j, ch in enumerate(line):
-                if ch == '.':
-                    l.append((j, i))
-        return l
+        return sorted(self.empty, key=lambda cell: (cell[1], cell[0]))
 
     def goal_check(self):
         """
@@ -160,8 +246,9 @@ class Board:
         :rtype: bool
         """
 
-        if self.grid[3][1] == char_goal and self.grid[3][2] == char_goal \
-            and self.grid[4][1] == char_goal and self.grid[4][2] == char_goal:
+        w = self.width
+        if self.grid[3 * w + 1] == char_goal and self.grid[3 * w + 2] == char_goal \
+            and self.grid[4 * w + 1] == char_goal and self.grid[4 * w + 2] == char_goal:
             return True
         return False
 
@@ -179,541 +266,3095 @@ class Board:
             if i.is_goal:
                 dist += abs(i.coord_x - 1) + abs(i.coord_y - 3)
         return dist
-            
 
 
-class State:
-    """
-    State class wrapping a Board with some extra current state information.
-    Note that State and Board are different. Board has the locations of the pieces. 
-    State has a Board and some extra information that is relevant to the search: 
-    heuristic function, f value, current depth and parent.
-    """
+    def key(self):
+        """
+        Pack the board into the same integer as BitBoard.key().
 
-    def __init__(self, board, f, depth, parent=None):
+        :return: The packed board.
+        :rtype: int
         """
-        :param board: The board of the state.
-        :type board: Board
-        :param f: The f value of current state.
-        :type f: int
-        :param depth: The depth of current state in the search tree.
-        :type depth: int
-        :param parent: The parent of current state.
-        :type parent: Optional[State]
+
+        return BitBoard.from_board(self).key()
+
+
+    def canonical_key(self):
         """
-        self.board = board
-        self.f = f
-        self.depth = depth
-        self.parent = parent
-        self.id = hash(board)  # The id for breaking ties.
-    
-    # def expand(self):
-    #     """
-    #     Expand the current state and return a list of new states.
-    #     """
+        Key shared by the board and its mirror image, see BitBoard.canonical_key().
 
-    
+        :rtype: int
+        """
 
+        return BitBoard.from_board(self).canonical_key()
 
-    def available_moves(self):
+
+    def can_move(self, ind, direction):
         """
-        Find the available moves for the current state.
+        Check if a piece can slide one step in a direction.
 
-        :return: A list of available moves.
-        :rtype: List[states]
+        :param ind: The index of the piece in self.pieces.
+        :type ind: int
+        :param direction: One of 'up', 'down', 'left' or 'right'.
+        :type direction: str
+        :rtype: bool
         """
 
-        new_states = []
+        dx, dy = directions[direction]
+        for x, y, _ in self.pieces[ind].cells():
+            x, y = x + dx, y + dy
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return False
+            if self.owner[y * self.width + x] not in (None, ind):
+                return False
+        return True
 
-        
-        
-        p = self.board.pieces
-        for ind, i in enumerate(p):
-            # print("inside\n\n")
-            # self.board.display()
-            # print("again\n\n")
-            
-            # print(copy)
-            # print(i)
-            # print('\n')
-            
-            #check if piece can move on board into empty space
-            if i.is_goal == True:
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y - 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #down
-                if i.coord_y + 2 <= 4:
-                    if self.board.grid[i.coord_y + 2][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y + 2][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-
-                #right
-                if i.coord_x + 2 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 2] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x + 2] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-            
 
+    def move_piece(self, ind, direction):
+        """
+        Create the board reached by moving one piece one step.
+
+        The pieces other than the moved one are shared with this board; the
+        flat grid and owner lists are copied, which is cheaper than copying
+        the pieces.
+
+        :param ind: The index of the piece in self.pieces.
+        :type ind: int
+        :param direction: One of 'up', 'down', 'left' or 'right'.
+        :type direction: str
+        :return: The new board.
+        :rtype: Board
+        """
 
-            if i.is_single:
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #down
-                if i.coord_y + 1 <= 4:
-                    if self.board.grid[i.coord_y + 1][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-
-                #right
-                if i.coord_x + 1 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                
-
-
-
-            if i.orientation == 'h':
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y - 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-
-                #down
-                if i.coord_y + 1 <= 4:
-                    if self.board.grid[i.coord_y + 1][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #right
-                if i.coord_x + 2 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 2] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-            
+        piece = self.pieces[ind]
+        moved = piece.move(direction)
+        pieces = list(self.pieces)
+        pieces[ind] = moved
 
+        grid = list(self.grid)
+        owner = list(self.owner)
+        old_cells = piece.cells()
+        for x, y, _ in old_cells:
+            grid[y * self.width + x] = '.'
+            owner[y * self.width + x] = None
+        for x, y, ch in moved.cells():
+            grid[y * self.width + x] = ch
+            owner[y * self.width + x] = ind
 
-            if i.orientation == 'v':
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #down
-                if i.coord_y + 2 <= 4:
-                    if self.board.grid[i.coord_y + 2][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-                #right
-                if i.coord_x + 1 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 1] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_states.append(State(Board(copy_list), self.f, self.depth + 1, self))
-
-
-        # print('\nnewstates\n')
-        # print(new_states)
-        return new_states
+        empty = [(x, y) for x, y in self.empty if owner[y * self.width + x] is None]
+        empty += [(x, y) for x, y, _ in old_cells if owner[y * self.width + x] is None]
+        return Board(pieces, grid, owner, empty)
 
-    
 
-    def available_moves_manhattan(self):
+    def play(self, code):
         """
-        Find the available moves for the current state.
+        Create the board reached by a move.
 
-        :return: A list of available moves.
-        :rtype: List[states]
+        :param code: The move, see encode_move().
+        :type code: int
+        :return: The new board.
+        :rtype: Board
         """
 
-        empty = self.board.findempty()
-        new_states = []
+        cell, direction = divmod(code, len(move_directions))
+        return self.move_piece(self.owner[cell], move_directions[direction])
 
-        
-        
-        
-        p = self.board.pieces
-        for ind, i in enumerate(p):
-
-            #check if piece can move on board into empty space
-            if i.is_goal == True:
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y - 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #down
-                if i.coord_y + 2 <= 4:
-                    if self.board.grid[i.coord_y + 2][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y + 2][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-
-                #right
-                if i.coord_x + 2 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 2] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x + 2] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-            
 
+    def successors(self):
+        """
+        Generate the boards reachable by moving one piece one step.
 
-            if i.is_single:
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #down
-                if i.coord_y + 1 <= 4:
-                    if self.board.grid[i.coord_y + 1][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-
-                #right
-                if i.coord_x + 1 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                
-
-
-
-            if i.orientation == 'h':
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y - 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-
-                #down
-                if i.coord_y + 1 <= 4:
-                    if self.board.grid[i.coord_y + 1][i.coord_x] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #right
-                if i.coord_x + 2 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 2] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-            
+        Only a piece next to one of the two empty cells can move, and it must
+        move towards that cell, so the moves are found from the empty cells 
+        rather than by scanning every piece. The moves are still generated
+        by piece and then in the order of directions, as DFS depends on it.
 
+        Each board comes with the move reaching it as the kind of the moved
+        piece (char_goal, char_single, 'h' or 'v') and the cell indices
+        (y * width + x) of its top left corner before and after the move.
 
-            if i.orientation == 'v':
-                #up
-                if i.coord_y - 1 >= 0:
-                    if self.board.grid[i.coord_y - 1][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('up')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #down
-                if i.coord_y + 2 <= 4:
-                    if self.board.grid[i.coord_y + 2][i.coord_x] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('down')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #left
-                if i.coord_x - 1 >= 0:
-                    if self.board.grid[i.coord_y][i.coord_x - 1] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x - 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('left')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-                #right
-                if i.coord_x + 1 <= 3:
-                    if self.board.grid[i.coord_y][i.coord_x + 1] == '.' and \
-                            self.board.grid[i.coord_y + 1][i.coord_x + 1] == '.':
-                        copy_list = deepcopy(p)
-                        copy_list[ind].move('right')
-                        new_board = Board(copy_list)
-                        new_states.append(State(new_board, self.depth + new_board.manhattan() , self.depth + 1, self))
-
-
-        # print('\nnewstates\n')
-        # print(new_states)
-        return new_states
+        :return: A generator of successor boards and the moves reaching them.
+        :rtype: Iterator[Tuple[Board, Tuple[str, int, int]]]
+        """
 
+        moves = set()
+        for bx, by in self.empty:
+            for order, (direction, (dx, dy)) in enumerate(directions.items()):
+                # the piece on the far side of the blank moves into it
+                x, y = bx - dx, by - dy
+                if not (0 <= x < self.width and 0 <= y < self.height):
+                    continue
+                ind = self.owner[y * self.width + x]
+                if ind is not None:
+                    moves.add((ind, order, direction))
+        for ind, _, direction in sorted(moves):
+            if self.can_move(ind, direction):
+                dx, dy = directions[direction]
+                piece = self.pieces[ind]
+                cell = piece.coord_y * self.width + piece.coord_x
+                yield self.move_piece(ind, direction), \
+                    (piece.kind(), cell, cell + dy * self.width + dx)
+
+
+
+def encode_move(move):
+    """
+    Pack a move as a small int: the top left cell of the moved piece and the
+    direction it moves in.
 
+    :param move: The move, as yielded by Board.successors().
+    :type move: Tuple[str, int, int]
+    :return: The move code, below 80.
+    :rtype: int
+    """
+    _, src, dst = move
+    step = dst - src
+    if step == -board_width:
+        direction = 0
+    elif step == board_width:
+        direction = 1
+    elif step == -1:
+        direction = 2
+    else:
+        direction = 3
+    return src * len(move_directions) + direction
+
+
+def macro_successors(board):
+    """
+    Generate every board reachable by sliding one piece any number of steps,
+    around corners included, as a single move (--macro-moves).
+
+    The slides of a piece are found breadth first from its single steps,
+    following the moves of the same piece, which is the one whose top left
+    cell is where the piece was last moved to.
+
+    :param board: The board to move on.
+    :type board: Union[Board, BitBoard]
+    :return: A generator of successor boards and the moves reaching them, 
+        see Board.successors(); the cells of a move are the first and last 
+        cell of the slide.
+    :rtype: Iterator[Tuple[Union[Board, BitBoard], Tuple[str, int, int]]]
+    """
+    slides = {}
+    for child, (kind, src, dst) in board.successors():
+        slides.setdefault((kind, src), []).append((child, dst))
+
+    for (kind, src), queue in slides.items():
+        reached = {src}
+        for child, dst in queue:  # the queue grows as it is walked
+            if dst in reached:
+                continue
+            reached.add(dst)
+            yield child, (kind, src, dst)
+            for grandchild, (_, step_src, step_dst) in child.successors():
+                if step_src == dst and step_dst not in reached:
+                    queue.append((grandchild, step_dst))
+
+
+def mirror_mask(mask):
+    """
+    Reflect a cell mask left to right, row by row.
+    """
 
-        
+    result = 0
+    for shift in range(0, board_width * board_height, board_width):
+        result |= reversed_rows[(mask >> shift) & 15] << shift
+    return result
 
 
-def read_from_file(filename):
+def iter_bits(mask):
+    """
+    Yield every set bit of mask as a single-bit integer, lowest first.
     """
-    Load initial board from a given file.
 
-    :param filename: The name of the given file.
-    :type filename: str
-    :return: A loaded board
-    :rtype: Board
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+def cell_mask(cells, char):
     """
+    Find a character in the cells of a board.
+
+    :param cells: The cells of the board, row by row.
+    :type cells: str
+    :param char: The character to find.
+    :type char: str
+    :return: The mask of the cells holding it.
+    :rtype: int
+    """
+    mask = 0
+    cell = cells.find(char)
+    while cell >= 0:
+        mask |= 1 << cell
+        cell = cells.find(char, cell + 1)
+    return mask
 
-    puzzle_file = open(filename, "r")
 
-    line_index = 0
-    pieces = []
-    g_found = False
+def render_row(index):
+    """
+    Draw a board row.
+
+    :param index: The 4-bit masks of the row's 1x1 pieces, left cells of
+        horizontal pieces, top cells of vertical pieces, bottom cells of
+        vertical pieces and goal piece cells, 4 bits apart in that order.
+    :type index: int
+    :return: The row as in the puzzle files.
+    :rtype: str
+    """
+    singles, horiz, top, bottom, goal = [(index >> shift) & 15 for shift in range(0, 20, 4)]
+    row = []
+    for x in range(board_width):
+        bit = 1 << x
+        if goal & bit:
+            row.append(char_goal)
+        elif singles & bit:
+            row.append(char_single)
+        elif horiz & bit:
+            row.append('<')
+        elif horiz & (bit >> 1):
+            row.append('>')
+        elif top & bit:
+            row.append('^')
+        elif bottom & bit:
+            row.append('v')
+        else:
+            row.append('.')
+    return ''.join(row)
+
+
+def render_key(key):
+    """
+    Draw a packed board (see BitBoard.key()) as in the puzzle files. There are
+    few distinct rows, so rows are drawn once and looked up in row_strings.
 
-    for line in puzzle_file:
+    :param key: The packed board.
+    :type key: int
+    :return: The board, one line per row.
+    :rtype: str
+    """
+    goal = key & 0x1f
+    singles, horiz, vert = (key >> 5) & full_mask, (key >> 25) & full_mask, key >> 45
+    goal_row, goal_bits = goal // board_width, 3 << (goal % board_width)
+
+    rows = []
+    bottom = 0
+    for y in range(board_height):
+        shift = y * board_width
+        top = (vert >> shift) & 15
+        index = ((singles >> shift) & 15) | ((horiz >> shift) & 15) << 4 | top << 8 \
+            | bottom << 12
+        if goal_row <= y <= goal_row + 1:
+            index |= goal_bits << 16
+        row = row_strings.get(index)
+        if row is None:
+            row = row_strings[index] = render_row(index)
+        rows.append(row)
+        bottom = top
+    return '\n'.join(rows)
+
+
+class BitBoard:
+    """
+    Compact Hua Rong Dao board stored as bitboards.
 
-        for x, ch in enumerate(line):
+    The goal piece is kept as the cell index of its top left corner and the
+    other pieces as 20-bit masks of the top left cells of every 1x1, 
+    horizontal 1x2 and vertical 1x2 piece. Pieces of the same kind are 
+    interchangeable, so no per-piece objects or grids are needed and moves
+    are generated with shifts and masks.
+    """
 
-            if ch == '^': # found vertical piece
-                pieces.append(Piece(False, False, x, line_index, 'v'))
-            elif ch == '<': # found horizontal piece
-                pieces.append(Piece(False, False, x, line_index, 'h'))
-            elif ch == char_single:
-                pieces.append(Piece(False, True, x, line_index, None))
-            elif ch == char_goal:
-                if g_found == False:
-                    pieces.append(Piece(True, False, x, line_index, None))
-                    g_found = True
-        line_index += 1
+    __slots__ = ('goal', 'singles', 'horiz', 'vert', 'empty')
 
-    puzzle_file.close()
+    def __init__(self, goal, singles, horiz, vert):
+        """
+        :param goal: The cell index of the top left corner of the goal piece.
+        :type goal: int
+        :param singles: The mask of cells holding a 1x1 piece.
+        :type singles: int
+        :param horiz: The mask of the left cells of the horizontal pieces.
+        :type horiz: int
+        :param vert: The mask of the top cells of the vertical pieces.
+        :type vert: int
+        """
 
-    board = Board(pieces)
-    
-    return board
+        self.goal = goal
+        self.singles = singles
+        self.horiz = horiz
+        self.vert = vert
+        self.empty = full_mask & ~((goal_cells << goal) | singles | horiz \
+            | (horiz << 1) | vert | (vert << board_width))
 
 
-def get_solution(state):
-    """
-    Get the solution path from the given state.
+    @classmethod
+    def from_board(cls, board):
+        """
+        Build the compact encoding of a Board.
 
-    :param state: The given state.
-    :type state: State
-    :return: A list of states from the initial state to the given state.
-    :rtype: list
-    """
-    solution = [state]
-    while state.parent != None:
-        state = state.parent
-        solution.append(state)
-    solution.reverse()
-    return solution
+        :param board: The board to encode.
+        :type board: Board
+        :return: The encoded board.
+        :rtype: BitBoard
+        """
 
+        goal = singles = horiz = vert = 0
+        for piece in board.pieces:
+            cell = piece.coord_y * board_width + piece.coord_x
+            if piece.is_goal:
+                goal = cell
+            elif piece.is_single:
+                singles |= 1 << cell
+            elif piece.orientation == 'h':
+                horiz |= 1 << cell
+            else:
+                vert |= 1 << cell
+        return cls(goal, singles, horiz, vert)
 
 
-def DFS(state):
-    """
-    Depth-first search algorithm recursively.
+    def to_board(self):
+        """
+        Convert back to a Board made of Pieces.
 
-    :param state: The initial state.
-    :type state: State
-    :return: A solution state.
-    :rtype: State
-    """
-    frontier = [state]
-    explored = []
-    # state.board.display()
-    # print("\n")
-    while frontier:
-        curr = frontier.pop()
-        if curr.board.display_string() not in explored:
-            
+        :return: The equivalent board.
+        :rtype: Board
+        """
 
-            # print(state.board.display())
-            # state.board.display()
-            # print('------\n')
-            # input()
-            explored.append(curr.board.display_string())
-            # print('explored: ', explored)
+        def coords(bit):
+            cell = bit.bit_length() - 1
+            return cell % board_width, cell // board_width
+
+        x, y = coords(1 << self.goal)
+        pieces = [Piece(True, False, x, y, None)]
+        for bit in iter_bits(self.singles):
+            x, y = coords(bit)
+            pieces.append(Piece(False, True, x, y, None))
+        for bit in iter_bits(self.horiz):
+            x, y = coords(bit)
+            pieces.append(Piece(False, False, x, y, 'h'))
+        for bit in iter_bits(self.vert):
+            x, y = coords(bit)
+            pieces.append(Piece(False, False, x, y, 'v'))
+        return Board(pieces)
+
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        Load a board from the lines of a puzzle without building Pieces, see
+        read_from_lines().
+
+        :param lines: The lines of the puzzle, top row first.
+        :type lines: Iterable[str]
+        :return: The loaded board.
+        :rtype: BitBoard
+        :raises ValueError: If the puzzle has no goal piece.
+        """
 
-            if curr.board.goal_check():
-                # print("\n\nhihi\n")
-                return curr
+        rows = [line.rstrip('\n')[:board_width].ljust(board_width, '.') for line in lines]
+        cells = ''.join(rows[:board_height])
+        goal = cells.find(char_goal)
+        if goal < 0:
+            raise ValueError("the puzzle has no goal piece")
+        return cls(goal, cell_mask(cells, char_single), cell_mask(cells, '<'), 
+            cell_mask(cells, '^'))
 
 
+    def key(self):
+        """
+        Pack the board into a single integer (61 bits).
 
-            for child in curr.available_moves():
-                # print("\n\nhihi\n")
-                # child.board.display()
-                # print('\n')
-                # print(child)
-                # print('child id: ', child.id)
-                if child.board.display_string() not in explored:
-                    frontier.append(child)
-                    # print('frontier: ', frontier)
-            # print('end------\n')
-        
+        :return: The packed board.
+        :rtype: int
+        """
 
+        return self.goal | (self.singles << 5) | (self.horiz << 25) \
+            | (self.vert << 45)
 
-def As_Man(state):
-    """
-    A* algorithm with Manhattan distance as heuristic.
-    """
-    frontier = [(state.f, state.id, state)]
-    explored = []
 
+    @classmethod
+    def from_key(cls, key):
+        """
+        Unpack a board produced by key().
+
+        :param key: The packed board.
+        :type key: int
+        :return: The decoded board.
+        :rtype: BitBoard
+        """
 
-    while frontier:
-        curr = heappop(frontier)[2]
+        return cls(key & 0x1f, (key >> 5) & full_mask, (key >> 25) & full_mask,
+            key >> 45)
 
 
-        if curr.board.display_string() not in explored:
-            explored.append(curr.board.display_string())
-            
-            if curr.board.goal_check():
-                return curr
-            for child in curr.available_moves_manhattan():
-                if child.board.display_string() not in explored:
-                    heappush(frontier,(child.f, child.id, child))
-    return None
+    def play(self, code):
+        """
+        Create the board reached by a move.
 
+        :param code: The move, see encode_move().
+        :type code: int
+        :return: The new board.
+        :rtype: BitBoard
+        """
 
+        cell, direction = divmod(code, len(move_directions))
+        dx, dy = directions[move_directions[direction]]
+        dst = cell + dy * board_width + dx
+        moved = (1 << cell) | (1 << dst)
+        g, s, h, v = self.goal, self.singles, self.horiz, self.vert
+        if g == cell:
+            return BitBoard(dst, s, h, v)
+        elif s >> cell & 1:
+            return BitBoard(g, s ^ moved, h, v)
+        elif h >> cell & 1:
+            return BitBoard(g, s, h ^ moved, v)
+        return BitBoard(g, s, h, v ^ moved)
+
+
+    def mirror(self):
+        """
+        Reflect the board left to right.
 
-def output_to_file(filename, solution):
-    """
-    Output the solution to a given file.
+        :return: The mirror image of the board.
+        :rtype: BitBoard
+        """
 
-    :param filename: The name of the given file.
-    :type filename: str
-    :param solution: The solution path.
-    :type solution: list
-    """
-    output_file = open(filename, "w")
-    for state in solution:
-        output_file.write(state.board.display_string())
-        output_file.write("\n")
-    output_file.close()
+        return BitBoard(self.goal + 2 - 2 * (self.goal % board_width), 
+            mirror_mask(self.singles), mirror_mask(self.horiz) >> 1, 
+            mirror_mask(self.vert))
 
 
+    def canonical_key(self):
+        """
+        Key shared by the board and its mirror image. The goal region is 
+        symmetric, so both boards are the same distance from the goal.
+        Pieces of the same kind are already indistinguishable in key().
 
-if __name__ == "__main__":
+        :return: The smaller of the two packed boards.
+        :rtype: int
+        """
 
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--inputfile",
-        type=str,
-        required=True,
-        help="The input file that contains the puzzle."
-    )
-    parser.add_argument(
-        "--outputfile",
-        type=str,
-        required=True,
-        help="The output file that contains the solution."
-    )
-    parser.add_argument(
-        "--algo",
-        type=str,
-        required=True,
-        choices=['astar', 'dfs'],
-        help="The searching algorithm."
-    )
-    args = parser.parse_args()
+        return min(self.key(), self.mirror().key())
 
-    # read the board from the file
-    board = read_from_file(args.inputfile)
 
-    # solve the puzzle
-    if args.algo == 'astar':
-        a = As_Man(State(board, 0, 0, None))
-        output_to_file(args.outputfile, get_solution(a))
-        
-    elif args.algo == 'dfs':
-        a = DFS(State(board, 0, 0, None))
-        output_to_file(args.outputfile, get_solution(a))
+    def display_string(self):
+        """
+        Return the current board as a string.
+        """
+
+        return render_key(self.key())
+
+
+    def display(self):
+        """
+        Print out the current board.
+        """
+
+        print(self.display_string())
+
+
+    def findempty(self):
+        """
+        Find the empty space on the board.
+
+        :return: A tuple of the x and y coordinate of the empty space.
+        :rtype: list(Tuple[int, int])
+        """
+
+        return [((bit.bit_length() - 1) % board_width, 
+            (bit.bit_length() - 1) // board_width) for bit in iter_bits(self.empty)]
+
+
+    def goal_check(self):
+        """
+        Check if the current board is the goal board.
+
+        :return: True if the current board is the goal board and False otherwise.
+        :rtype: bool
+        """
+
+        return self.goal == goal_anchor
+
+
+    def manhattan(self):
+        """
+        Calculate the manhattan distance of the current board.
+
+        :return: The manhattan distance of the current board.
+        :rtype: int
+        """
+
+        return abs(self.goal % board_width - 1) + abs(self.goal // board_width - 3)
+
+
+    def successors(self):
+        """
+        Generate every board reachable by moving one piece one step.
+
+        A piece can move when the cells it slides into are empty, which is
+        tested for all pieces of a kind at once by shifting the empty mask.
+
+        :return: A generator of successor boards and the moves reaching them,
+            see Board.successors().
+        :rtype: Iterator[Tuple[BitBoard, Tuple[str, int, int]]]
+        """
+
+        w = board_width
+        e = self.empty
+        g, s, h, v = self.goal, self.singles, self.horiz, self.vert
+
+        # goal piece
+        x, y = g % w, g // w
+        if y > 0 and (e >> (g - w)) & 3 == 3:
+            yield BitBoard(g - w, s, h, v), (char_goal, g, g - w)
+        if y < board_height - 2 and (e >> (g + 2 * w)) & 3 == 3:
+            yield BitBoard(g + w, s, h, v), (char_goal, g, g + w)
+        if x > 0 and (e >> (g - 1)) & 1 and (e >> (g + w - 1)) & 1:
+            yield BitBoard(g - 1, s, h, v), (char_goal, g, g - 1)
+        if x < w - 2 and (e >> (g + 2)) & 1 and (e >> (g + w + 2)) & 1:
+            yield BitBoard(g + 1, s, h, v), (char_goal, g, g + 1)
+
+        # 1x1 pieces
+        for bit in iter_bits(s & (e << w)):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s ^ bit ^ (bit >> w), h, v), (char_single, cell, cell - w)
+        for bit in iter_bits(s & (e >> w)):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s ^ bit ^ (bit << w), h, v), (char_single, cell, cell + w)
+        for bit in iter_bits(s & (e << 1) & not_left_mask):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s ^ bit ^ (bit >> 1), h, v), (char_single, cell, cell - 1)
+        for bit in iter_bits(s & (e >> 1) & not_right_mask):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s ^ bit ^ (bit << 1), h, v), (char_single, cell, cell + 1)
+
+        # horizontal pieces, anchored on their left cell
+        for bit in iter_bits(h & (e << w) & (e << (w - 1))):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h ^ bit ^ (bit >> w), v), ('h', cell, cell - w)
+        for bit in iter_bits(h & (e >> w) & (e >> (w + 1))):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h ^ bit ^ (bit << w), v), ('h', cell, cell + w)
+        for bit in iter_bits(h & (e << 1) & not_left_mask):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h ^ bit ^ (bit >> 1), v), ('h', cell, cell - 1)
+        for bit in iter_bits(h & (e >> 2) & (col_masks[0] | col_masks[1])):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h ^ bit ^ (bit << 1), v), ('h', cell, cell + 1)
+
+        # vertical pieces, anchored on their top cell
+        for bit in iter_bits(v & (e << w)):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h, v ^ bit ^ (bit >> w)), ('v', cell, cell - w)
+        for bit in iter_bits(v & (e >> (2 * w))):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h, v ^ bit ^ (bit << w)), ('v', cell, cell + w)
+        for bit in iter_bits(v & (e << 1) & (e >> (w - 1)) & not_left_mask):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h, v ^ bit ^ (bit >> 1)), ('v', cell, cell - 1)
+        for bit in iter_bits(v & (e >> 1) & (e >> (w + 1)) & not_right_mask):
+            cell = bit.bit_length() - 1
+            yield BitBoard(g, s, h, v ^ bit ^ (bit << 1)), ('v', cell, cell + 1)
+            
+
+
+class State:
+    """
+    State class wrapping a Board with some extra current state information.
+    Note that State and Board are different. Board has the locations of the pieces. 
+    State has a Board and some extra information that is relevant to the search: 
+    heuristic function, f value, current depth and parent.
+    """
+
+    __slots__ = ('board', 'f', 'depth', 'parent', 'h', 'nodes', 'node', 'key')
+
+    # When True, mirror images share a closed list key.
+    symmetric = False
+    # When True, a slide of one piece over several cells is one move, see
+    # macro_successors().
+    macro = False
+
+    def __init__(self, board, f, depth, parent=None, h=None, nodes=None, node=None):
+        """
+        :param board: The board of the state.
+        :type board: Board
+        :param f: The f value of current state.
+        :type f: int
+        :param depth: The depth of current state in the search tree.
+        :type depth: int
+        :param parent: The parent of current state.
+        :type parent: Optional[State]
+        :param h: The heuristic data of the board, see Heuristic.
+        :type h: Any
+        :param nodes: The move log of the search, which replaces parent.
+        :type nodes: Optional[NodeTable]
+        :param node: The index of the state in nodes.
+        :type node: Optional[int]
+        """
+        self.board = board
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.h = h
+        self.nodes = nodes
+        self.node = node
+        # The closed list key, computed once.
+        self.key = board.canonical_key() if State.symmetric else board.key()
+    
+    # def expand(self):
+    #     """
+    #     Expand the current state and return a list of new states.
+    #     """
+
+    
+
+
+    def successors(self):
+        """
+        Generate the boards reachable from the current state in one move, 
+        a single step or a slide depending on State.macro.
+
+        :rtype: Iterator[Tuple[Board, Tuple[str, int, int]]]
+        """
+
+        if State.macro:
+            return macro_successors(self.board)
+        return self.board.successors()
+
+
+    def available_moves(self):
+        """
+        Find the available moves for the current state.
+
+        :return: A generator of successor states.
+        :rtype: Iterator[State]
+        """
+
+        nodes = self.nodes
+        for board, move in self.successors():
+            if nodes is None:
+                yield type(self)(board, self.f, self.depth + 1, self)
+            else:
+                yield type(self)(board, self.f, self.depth + 1, None, None, nodes, 
+                    nodes.add(self.node, move))
+
+
+
+    def available_moves_manhattan(self, heuristic=None):
+        """
+        Find the available moves for the current state, with the f value of
+        each successor set from the Manhattan distance. The heuristic of a
+        successor is updated from the heuristic data of this state.
+
+        :param heuristic: A heuristic to use instead of the Manhattan distance.
+        :type heuristic: Optional[Heuristic]
+        :return: A generator of successor states.
+        :rtype: Iterator[State]
+        """
+
+        if heuristic is None:
+            heuristic = heuristics['manhattan']()
+        if self.h is None:
+            self.h = heuristic.evaluate(self.board)
+        nodes = self.nodes
+        for board, move in self.successors():
+            h = heuristic.update(self.h, board, move)
+            if nodes is None:
+                yield type(self)(board, self.depth + 1 + heuristic.value(h), 
+                    self.depth + 1, self, h)
+            else:
+                yield type(self)(board, self.depth + 1 + heuristic.value(h), 
+                    self.depth + 1, None, h, nodes, nodes.add(self.node, move))
+
+
+
+
+class NodeTable:
+    """
+    The search tree as a move log. Node 0 is the initial board and node i was
+    reached from node parents[i] by the move moves[i] (see encode_move()), 
+    which costs a few bytes per node instead of a State and a board.
+
+    States of a search started from root() keep their node index rather than 
+    their parent, so expanded states can be freed; the solution path is 
+    replayed from the initial board.
+    """
+
+    def __init__(self, board):
+        """
+        :param board: The initial board.
+        :type board: Board
+        """
+        self.board = board
+        self.parents = array('l', [-1])
+        self.moves = array('B', [0])
+
+    def __len__(self):
+        return len(self.parents)
+
+    def root(self):
+        """
+        The state of the initial board.
+
+        :rtype: State
+        """
+        return State(self.board, 0, 0, None, None, self, 0)
+
+    def add(self, parent, move):
+        """
+        Log a node.
+
+        :param parent: The index of the parent node.
+        :type parent: int
+        :param move: The move from the parent, see Board.successors().
+        :type move: Tuple[str, int, int]
+        :return: The index of the new node.
+        :rtype: int
+        """
+        self.parents.append(parent)
+        self.moves.append(encode_move(move))
+        return len(self.parents) - 1
+
+    def replay(self, node):
+        """
+        Replay the moves from the initial board to a node.
+
+        :param node: The index of the node.
+        :type node: int
+        :return: A generator of the states on the path, starting with the 
+            initial board.
+        :rtype: Iterator[State]
+        """
+        codes = array('B')
+        while node > 0:
+            codes.append(self.moves[node])
+            node = self.parents[node]
+        codes.reverse()
+
+        board = self.board
+        yield State(board, 0, 0)
+        for depth, code in enumerate(codes, 1):
+            board = board.play(code)
+            yield State(board, depth, depth)
+
+    def replay_keys(self, node):
+        """
+        Replay the moves from the initial board to a node on BitBoards, 
+        without building States or Boards.
+
+        :param node: The index of the node.
+        :type node: int
+        :return: A generator of the packed boards on the path, starting with 
+            the initial board.
+        :rtype: Iterator[int]
+        """
+        codes = array('B')
+        while node > 0:
+            codes.append(self.moves[node])
+            node = self.parents[node]
+        codes.reverse()
+
+        board = self.board
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        yield board.key()
+        for code in codes:
+            board = board.play(code)
+            yield board.key()
+
+
+
+
+class ClosedSet:
+    """
+    Closed list of the searches, a hash set of board keys.
+    """
+
+    def __init__(self):
+        self.keys = set()
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key):
+        """
+        Mark a board key as explored.
+
+        :param key: The key of the explored board.
+        :type key: int
+        """
+        self.keys.add(key)
+
+
+
+class BoundedClosedSet(ClosedSet):
+    """
+    Closed list holding at most limit keys. When full, the least recently
+    seen key is forgotten, so its board may be explored again later.
+    A* stays optimal, but DFS may loop between forgotten boards forever, so
+    only A* takes a bounded closed list.
+    """
+
+    def __init__(self, limit):
+        """
+        :param limit: The maximum number of keys kept.
+        :type limit: int
+        """
+        self.keys = OrderedDict()
+        self.limit = limit
+
+    def __contains__(self, key):
+        if key in self.keys:
+            self.keys.move_to_end(key)
+            return True
+        return False
+
+    def add(self, key):
+        """
+        Mark a board key as explored, evicting the oldest key when full.
+
+        :param key: The key of the explored board.
+        :type key: int
+        """
+        self.keys[key] = None
+        self.keys.move_to_end(key)
+        if len(self.keys) > self.limit:
+            self.keys.popitem(last=False)
+
+
+def make_closed_set(limit=None):
+    """
+    Create the closed list for a search.
+
+    :param limit: The maximum number of keys kept, or None for no limit.
+    :type limit: Optional[int]
+    :rtype: ClosedSet
+    """
+    if limit is None:
+        return ClosedSet()
+    return BoundedClosedSet(limit)
+
+
+
+class BucketQueue:
+    """
+    Open list of A*, for the small integer f values of HRD: buckets[f][depth]
+    holds the states with that f and depth by board key, in push order. 
+    pop() takes the smallest f and, among equal f, the deepest state, most 
+    recently pushed first, so ties on a plateau go to the states closest to
+    the goal. Both ends cost O(1) amortized, as the smallest f never 
+    decreases by much and a bucket is never deeper than its f.
+
+    A board is on the queue at most once: pushing it again only replaces
+    the queued state when the new one is shallower (decrease-key), so
+    the queue holds no more states than there are distinct frontier boards.
+    """
+
+    __slots__ = ('buckets', 'queued', 'min_f')
+
+    def __init__(self):
+        self.buckets = []
+        self.queued = {}  # the queued state of each board key
+        self.min_f = 0
+
+    def __len__(self):
+        return len(self.queued)
+
+    def __contains__(self, key):
+        return key in self.queued
+
+    def push(self, state):
+        """
+        Add a state at its f and depth, unless its board is already queued
+        at most as deep.
+
+        :param state: The state, with an integer f.
+        :type state: State
+        :return: False if the state was dropped as a duplicate.
+        :rtype: bool
+        """
+        f, depth, key = state.f, state.depth, state.key
+        queued = self.queued
+        old = queued.get(key)
+        if old is not None:
+            # the shallower state is kept, as its f may be an exact cached 
+            # distance larger than a deeper state's estimate
+            if old.depth <= depth:
+                return False
+            del self.buckets[old.f][old.depth][key]
+        buckets = self.buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        bucket = buckets[f]
+        while len(bucket) <= depth:
+            bucket.append({})
+        bucket[depth][key] = state
+        if f < self.min_f or not queued:
+            self.min_f = f
+        queued[key] = state
+        return True
+
+    def pop(self):
+        """
+        Remove the deepest of the states with the smallest f, see BucketQueue.
+
+        :return: The state.
+        :rtype: State
+        """
+        if not self.queued:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self.buckets
+        f = self.min_f
+        while True:
+            bucket = buckets[f]
+            while bucket and not bucket[-1]:
+                bucket.pop()
+            if bucket:
+                break
+            f += 1
+        self.min_f = f
+        key, state = bucket[-1].popitem()
+        del self.queued[key]
+        return state
+
+
+
+class TranspositionTable:
+    """
+    Fixed size table of the smallest depth at which boards were reached, for
+    iterative deepening. Each board has one slot, picked by a scrambled key;
+    when two boards share a slot the shallower one is kept, as pruning it 
+    saves the larger subtree. The table takes 10 bytes a slot however many
+    boards are searched.
+    """
+
+    __slots__ = ('keys', 'depths')
+
+    def __init__(self, size):
+        """
+        :param size: The number of slots.
+        :type size: int
+        """
+        self.keys = array('q', [-1]) * size
+        self.depths = array('H', [0]) * size
+
+    def __len__(self):
+        return len(self.keys)
+
+    def slot(self, key):
+        return (((key * 0x9e3779b97f4a7c15) & 0xffffffffffffffff) >> 32) % len(self.keys)
+
+    def reached(self, key, depth):
+        """
+        Check if a board was reached at most as deep.
+
+        :param key: The closed list key of the board.
+        :type key: int
+        :param depth: The depth it is reached at now.
+        :type depth: int
+        :rtype: bool
+        """
+        slot = self.slot(key)
+        return self.keys[slot] == key and self.depths[slot] <= depth
+
+    def add(self, key, depth):
+        """
+        Record the depth a board is reached at, unless its slot holds a 
+        shallower board.
+
+        :param key: The closed list key of the board.
+        :type key: int
+        :param depth: The depth it is reached at.
+        :type depth: int
+        """
+        slot = self.slot(key)
+        if self.keys[slot] == -1 or self.keys[slot] == key or depth <= self.depths[slot]:
+            self.keys[slot] = key
+            self.depths[slot] = depth
+
+    def clear(self):
+        """
+        Forget every board.
+        """
+        self.keys = array('q', [-1]) * len(self.keys)
+
+
+
+
+
+def bit_count(mask):
+    """
+    Count the set bits of mask.
+    """
+    return bin(mask).count('1')
+
+
+class Heuristic:
+    """
+    Base class of the A* heuristics.
+
+    A heuristic keeps some data per state: evaluate() computes it for a board
+    from scratch and update() derives a successor's data from its parent's
+    data and the move between them, which is usually much cheaper. value() 
+    turns the data into the heuristic value. By default the data is the value.
+    """
+
+    def evaluate(self, board):
+        """
+        :param board: The board to evaluate.
+        :type board: Union[Board, BitBoard]
+        :return: The heuristic data of the board.
+        """
+        raise NotImplementedError
+
+    def update(self, h, board, move):
+        """
+        :param h: The heuristic data of the parent board.
+        :param board: The successor board.
+        :type board: Union[Board, BitBoard]
+        :param move: The move from the parent, see Board.successors().
+        :type move: Tuple[str, int, int]
+        :return: The heuristic data of the successor.
+        """
+        return self.evaluate(board)
+
+    def value(self, h):
+        """
+        :param h: The heuristic data of a board.
+        :return: The heuristic value.
+        :rtype: int
+        """
+        return h
+
+
+
+class ManhattanHeuristic(Heuristic):
+    """
+    Manhattan distance of the goal piece to the exit.
+    """
+
+    def evaluate(self, board):
+        return board.manhattan()
+
+    def update(self, h, board, move):
+        kind, _, dst = move
+        if kind != char_goal:
+            return h
+        return abs(dst % board_width - 1) + abs(dst // board_width - 3)
+
+
+
+class BlockingHeuristic(Heuristic):
+    """
+    Manhattan distance plus the number of other pieces on the exit cells,
+    each of which has to move at least once.
+    """
+
+    region = goal_cells << goal_anchor
+
+    def blockers(self, board):
+        region = self.region
+        return bit_count(board.singles & region) \
+            + bit_count(board.horiz & (region | (region >> 1))) \
+            + bit_count(board.vert & (region | (region >> board_width)))
+
+    def evaluate(self, board):
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        return board.manhattan() + self.blockers(board)
+
+    def update(self, h, board, move):
+        kind, src, dst = move
+        if kind == char_goal:
+            # other pieces stay put, so only the distance changes
+            return h + abs(dst % board_width - 1) + abs(dst // board_width - 3) \
+                - abs(src % board_width - 1) - abs(src // board_width - 3)
+        shape = shape_masks[kind]
+        return h + bool((shape << dst) & self.region) - bool((shape << src) & self.region)
+
+
+
+class MacroHeuristic(BlockingHeuristic):
+    """
+    Heuristic for --macro-moves, where the other heuristics overestimate as
+    a slide can take the goal piece several cells. Each slide moves one 
+    piece, so the goal piece away from the exit and every piece on the exit
+    cells take a move each.
+    """
+
+    def evaluate(self, board):
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        return (board.goal != goal_anchor) + self.blockers(board)
+
+    def update(self, h, board, move):
+        kind, src, dst = move
+        if kind == char_goal:
+            return h + (dst != goal_anchor) - (src != goal_anchor)
+        return BlockingHeuristic.update(self, h, board, move)
+
+
+
+class ConflictHeuristic(BlockingHeuristic):
+    """
+    Blocking heuristic plus a linear-conflict style penalty. When the goal 
+    piece is lined up above the exit, every other piece in the corridor 
+    between them must move, or the goal piece must step aside and back at a
+    cost of two moves, so min(corridor pieces, 2) more moves are needed.
+    """
+
+    def corridor(self, goal):
+        """
+        :return: The mask of the corridor cells below a goal piece at goal
+            and above the exit, not counting the exit cells.
+        :rtype: int
+        """
+        if goal % board_width != 1:
+            return 0
+        mask = 0
+        for row in range(goal // board_width + 2, goal_anchor // board_width):
+            mask |= 6 << (row * board_width)
+        return mask
+
+    def evaluate(self, board):
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        corridor = self.corridor(board.goal)
+        # pieces reaching into the exit are counted as blockers already
+        outside = ~self.region
+        penalty = bit_count(board.singles & corridor) \
+            + bit_count(board.horiz & (corridor | (corridor >> 1)) \
+                & outside & (outside >> 1)) \
+            + bit_count(board.vert & (corridor | (corridor >> board_width)) \
+                & outside & (outside >> board_width))
+        return board.manhattan() + self.blockers(board) + min(penalty, 2)
+
+    def update(self, h, board, move):
+        kind, src, dst = move
+        if kind != char_goal:
+            # a move away from the exit and from every possible corridor 
+            # changes neither the blockers nor the penalty
+            shape = shape_masks[kind]
+            touched = (shape << src) | (shape << dst)
+            if not touched & (self.region | self.corridor(1)):
+                return h
+        return self.evaluate(board)
+
+
+
+class MaxHeuristic(Heuristic):
+    """
+    Maximum of several admissible heuristics. The data is the tuple of the
+    data of each heuristic, which are all updated incrementally.
+    """
+
+    def __init__(self, parts):
+        """
+        :param parts: The heuristics to combine.
+        :type parts: List[Heuristic]
+        """
+        self.parts = parts
+
+    def evaluate(self, board):
+        return tuple(part.evaluate(board) for part in self.parts)
+
+    def update(self, h, board, move):
+        return tuple(part.update(part_h, board, move) \
+            for part, part_h in zip(self.parts, h))
+
+    def value(self, h):
+        return max(part.value(part_h) for part, part_h in zip(self.parts, h))
+
+
+
+
+class PatternDatabase(Heuristic):
+    """
+    Pattern database heuristic for the goal piece.
+
+    Boards are abstracted by dropping the 1x1 pieces, leaving the goal piece
+    and the horizontal and vertical 1x2 pieces as interchangeable shapes.
+    Every real move is a move or a no-op in the abstraction, so the exact 
+    abstract distance to the goal is an admissible and consistent heuristic.
+    The table holds that distance for every abstract board that can reach
+    the goal, keyed by canonical_key().
+    """
+
+    def __init__(self, horiz, vert, table):
+        """
+        :param horiz: The number of horizontal 1x2 pieces.
+        :type horiz: int
+        :param vert: The number of vertical 1x2 pieces.
+        :type vert: int
+        :param table: The distance to the goal of each abstract board key.
+        :type table: Dict[int, int]
+        """
+        self.horiz = horiz
+        self.vert = vert
+        self.table = table
+        # Larger than any distance, for boards that cannot reach the goal.
+        self.unsolvable = max(table.values(), default=0) + 1
+
+    def matches(self, board):
+        """
+        Check that the database was built for the pieces of a board.
+
+        :type board: BitBoard
+        :rtype: bool
+        """
+        return bin(board.horiz).count('1') == self.horiz \
+            and bin(board.vert).count('1') == self.vert
+
+    def lookup(self, board):
+        """
+        Find the abstract distance of a board to the goal.
+
+        :param board: The board to look up.
+        :type board: Union[Board, BitBoard]
+        :return: The heuristic value of the board.
+        :rtype: int
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        key = BitBoard(board.goal, 0, board.horiz, board.vert).canonical_key()
+        return self.table.get(key, self.unsolvable)
+
+    def evaluate(self, board):
+        return self.lookup(board)
+
+    def update(self, h, board, move):
+        # the 1x1 pieces are not part of the pattern
+        if move[0] == char_single:
+            return h
+        return self.lookup(board)
+
+    def save(self, filename):
+        """
+        Write the database to a file.
+
+        :param filename: The name of the file.
+        :type filename: str
+        """
+        with open(filename, "wb") as pdb_file:
+            pickle.dump((self.horiz, self.vert, self.table), pdb_file, 
+                pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a database written by save().
+
+        :param filename: The name of the file.
+        :type filename: str
+        :rtype: PatternDatabase
+        """
+        with open(filename, "rb") as pdb_file:
+            horiz, vert, table = pickle.load(pdb_file)
+        return cls(horiz, vert, table)
+
+
+
+def goal_layouts(horiz, vert, singles=0):
+    """
+    Enumerate the boards with the goal piece on the exit and the given
+    numbers of other pieces placed anywhere else.
+
+    :param horiz: The number of horizontal 1x2 pieces.
+    :type horiz: int
+    :param vert: The number of vertical 1x2 pieces.
+    :type vert: int
+    :param singles: The number of 1x1 pieces.
+    :type singles: int
+    :return: A generator of goal boards.
+    :rtype: Iterator[BitBoard]
+    """
+
+    w = board_width
+    size = board_width * board_height
+
+    def place(kind, count, start, free, masks):
+        if count == 0:
+            if kind == 2:
+                yield masks
+            else:
+                counts = (horiz, vert, singles)
+                yield from place(kind + 1, counts[kind + 1], 0, free, masks)
+            return
+        for cell in range(start, size):
+            if kind == 0:
+                # horizontal piece on cell and the cell to its right
+                if cell % w == w - 1:
+                    continue
+                cells = 3 << cell
+            elif kind == 1:
+                # vertical piece on cell and the cell below
+                if cell >= size - w:
+                    continue
+                cells = (1 << cell) | (1 << (cell + w))
+            else:
+                cells = 1 << cell
+            if cells & free == cells:
+                new_masks = list(masks)
+                new_masks[kind] |= 1 << cell
+                yield from place(kind, count - 1, cell + 1, free ^ cells, new_masks)
+
+    free = full_mask & ~(goal_cells << goal_anchor)
+    for h, v, s in place(0, horiz, 0, free, [0, 0, 0]):
+        yield BitBoard(goal_anchor, s, h, v)
+
+
+def build_pattern_database(horiz, vert):
+    """
+    Build the pattern database for a set of pieces by breadth-first search
+    backwards from every abstract goal board. Moves are reversible, so the
+    backward search uses the ordinary move generator.
+
+    :param horiz: The number of horizontal 1x2 pieces.
+    :type horiz: int
+    :param vert: The number of vertical 1x2 pieces.
+    :type vert: int
+    :rtype: PatternDatabase
+    """
+
+    table = {}
+    frontier = []
+    for board in goal_layouts(horiz, vert):
+        key = board.canonical_key()
+        if key not in table:
+            table[key] = 0
+            frontier.append(board)
+
+    dist = 0
+    while frontier:
+        dist += 1
+        next_frontier = []
+        for board in frontier:
+            for child, _ in board.successors():
+                key = child.canonical_key()
+                if key not in table:
+                    table[key] = dist
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    return PatternDatabase(horiz, vert, table)
+
+
+
+# The heuristics selectable with --heuristic. The pattern database ones
+# take the loaded PatternDatabase.
+heuristics = {
+    'manhattan': lambda pdb=None: ManhattanHeuristic(),
+    'blocking': lambda pdb=None: BlockingHeuristic(),
+    'conflict': lambda pdb=None: ConflictHeuristic(),
+    'macro': lambda pdb=None: MacroHeuristic(),
+    'pdb': lambda pdb: pdb,
+    'max': lambda pdb=None: MaxHeuristic([ConflictHeuristic()] \
+        + ([pdb] if pdb is not None else [])),
+}
+
+
+
+
+class DistanceTable:
+    """
+    Exact distance to the goal of every board reachable from a puzzle, 
+    memory-mapped from a file written by build_distance_table(). 
+
+    The file holds a header (magic and board count), the sorted canonical
+    keys of the boards as unsigned 64-bit integers and then their distances
+    as unsigned 16-bit integers, table_unsolvable for boards that cannot 
+    reach the goal. Lookups are binary searches over the mapped keys.
+    """
+
+    def __init__(self, filename):
+        """
+        :param filename: The name of the table file.
+        :type filename: str
+        """
+        self.file = open(filename, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size = struct.unpack_from("<8sQ", self.map)
+        if magic != table_magic:
+            raise ValueError("{} is not a distance table".format(filename))
+        header = struct.calcsize("<8sQ")
+        view = memoryview(self.map)
+        self.keys = view[header:header + 8 * size].cast('Q')
+        self.distances = view[header + 8 * size:header + 10 * size].cast('H')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, board):
+        """
+        Find the distance of a board to the goal.
+
+        :param board: The board to look up.
+        :type board: Union[Board, BitBoard]
+        :return: The distance, or None if the board is not in the table or
+            cannot reach the goal.
+        :rtype: Optional[int]
+        """
+        key = board.canonical_key()
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        dist = self.distances[i]
+        return None if dist == table_unsolvable else dist
+
+    def solve(self, board):
+        """
+        Follow the table from a board to the goal, always moving to a board
+        one step closer.
+
+        :param board: The initial board.
+        :type board: Union[Board, BitBoard]
+        :return: A solution state, or None if the board is not in the table
+            or cannot reach the goal.
+        :rtype: Optional[State]
+        """
+        dist = self.lookup(board)
+        if dist is None:
+            return None
+        state = State(board, dist, 0, None)
+        while dist > 0:
+            for child, _ in state.board.successors():
+                if self.lookup(child) == dist - 1:
+                    break
+            dist -= 1
+            state = State(child, dist + state.depth + 1, state.depth + 1, state)
+        return state
+
+    def close(self):
+        self.keys.release()
+        self.distances.release()
+        self.map.close()
+        self.file.close()
+
+
+
+class SolutionCache:
+    """
+    Optimal solutions kept across runs in an sqlite database. Every board on
+    a stored solution is kept under its canonical key with its distance to 
+    the goal and the key of the board after it on the solution, written for 
+    the board of the canonical key; a mirrored board follows the mirror 
+    image of the stored path.
+
+    Only optimal solutions may be stored, as each part of one is optimal and
+    the distances are then exact.
+    """
+
+    def __init__(self, filename):
+        """
+        :param filename: The name of the database file, created if missing.
+        :type filename: str
+        """
+        self.connection = sqlite3.connect(filename, timeout=60)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS boards ("
+                "key INTEGER PRIMARY KEY, distance INTEGER NOT NULL, next INTEGER)")
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM boards").fetchone()[0]
+
+    def keys(self):
+        """
+        Read the keys of the cached boards and of their mirror images, so
+        that a search can test a state key (see State.key) without a query.
+
+        :return: The keys.
+        :rtype: Set[int]
+        """
+        keys = set()
+        for (key,) in self.connection.execute("SELECT key FROM boards"):
+            keys.add(key)
+            keys.add(BitBoard.from_key(key).mirror().key())
+        return keys
+
+    def lookup(self, board):
+        """
+        Find a board in the cache.
+
+        :param board: The board to look up.
+        :type board: Union[Board, BitBoard]
+        :return: The distance of the board to the goal and the key of the
+            next board on the way, None at the goal, or None if the board 
+            is not in the cache.
+        :rtype: Optional[Tuple[int, Optional[int]]]
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        key = board.key()
+        canonical = board.canonical_key()
+        row = self.connection.execute("SELECT distance, next FROM boards WHERE key = ?",
+            (canonical,)).fetchone()
+        if row is None:
+            return None
+        dist, next_key = row
+        if next_key is not None and key != canonical:
+            next_key = BitBoard.from_key(next_key).mirror().key()
+        return dist, next_key
+
+    def complete(self, state):
+        """
+        Follow the cached path from a state to the goal.
+
+        :param state: A state whose board is in the cache.
+        :type state: State
+        :return: The goal state at the end of the path.
+        :rtype: State
+        """
+        entry = self.lookup(state.board)
+        while entry[1] is not None:
+            state = next(child for child in state.available_moves() \
+                if child.board.key() == entry[1])
+            entry = self.lookup(state.board)
+        return state
+
+    def solve(self, board):
+        """
+        Answer a board from the cache.
+
+        :param board: The initial board.
+        :type board: Union[Board, BitBoard]
+        :return: A solution state, or None if the board is not in the cache.
+        :rtype: Optional[State]
+        """
+        if self.lookup(board) is None:
+            return None
+        return self.complete(State(board, 0, 0, None))
+
+    def store(self, solution):
+        """
+        Add the boards of an optimal solution, keeping the shorter distance
+        of a board already in the cache.
+
+        :param solution: The states from the initial board to the goal.
+        :type solution: Iterable[State]
+        """
+        boards = [state.board if isinstance(state.board, BitBoard) \
+            else BitBoard.from_board(state.board) for state in solution]
+        rows = []
+        for i, board in enumerate(boards):
+            canonical = board.canonical_key()
+            next_key = None
+            if i + 1 < len(boards):
+                after = boards[i + 1]
+                next_key = after.key() if board.key() == canonical else after.mirror().key()
+            rows.append((canonical, len(boards) - 1 - i, next_key))
+        with self.connection:
+            self.connection.executemany("INSERT INTO boards VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET distance = excluded.distance, "
+                "next = excluded.next WHERE excluded.distance < boards.distance", rows)
+
+    def close(self):
+        self.connection.close()
+
+
+
+def build_distance_table(board, filename):
+    """
+    Enumerate every board reachable from a board, find the exact distance
+    of each to the goal by breadth-first search backwards from the goal 
+    boards among them, and write a DistanceTable file. Boards are stored
+    under their canonical keys, so mirror images share an entry.
+
+    :param board: A board with the pieces to enumerate.
+    :type board: Union[Board, BitBoard]
+    :param filename: The name of the table file.
+    :type filename: str
+    :return: The number of boards and the largest finite distance.
+    :rtype: Tuple[int, int]
+    """
+    start = board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+
+    # forward: the reachable boards, up to mirror images
+    seen = {start.canonical_key()}
+    frontier = [start]
+    goals = []
+    while frontier:
+        next_frontier = []
+        for curr in frontier:
+            if curr.goal_check():
+                goals.append(curr)
+            for child, _ in curr.successors():
+                key = child.canonical_key()
+                if key not in seen:
+                    seen.add(key)
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    # retrograde: moves are reversible, so search forward from the goals
+    dist = {goal.canonical_key(): 0 for goal in goals}
+    frontier = goals
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for curr in frontier:
+            for child, _ in curr.successors():
+                key = child.canonical_key()
+                if key not in dist:
+                    dist[key] = depth
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    keys = array('Q', sorted(seen))
+    distances = array('H', (dist.get(key, table_unsolvable) for key in keys))
+    with open(filename, "wb") as table_file:
+        table_file.write(struct.pack("<8sQ", table_magic, len(keys)))
+        keys.tofile(table_file)
+        distances.tofile(table_file)
+    return len(keys), max(dist.values(), default=0)
+
+
+
+def read_from_file(filename):
+    """
+    Load initial board from a given file.
+
+    :param filename: The name of the given file.
+    :type filename: str
+    :return: A loaded board
+    :rtype: Board
+    """
+
+    puzzle_file = open(filename, "r")
+    board = read_from_lines(puzzle_file)
+    puzzle_file.close()
+    
+    return board
+
+
+def read_from_lines(lines):
+    """
+    Load a board from the lines of a puzzle.
+
+    :param lines: The lines of the puzzle, top row first.
+    :type lines: Iterable[str]
+    :return: A loaded board
+    :rtype: Board
+    """
+
+    line_index = 0
+    pieces = []
+    g_found = False
+
+    for line in lines:
+
+        for x, ch in enumerate(line):
+
+            if ch == '^': # found vertical piece
+                pieces.append(Piece(False, False, x, line_index, 'v'))
+            elif ch == '<': # found horizontal piece
+                pieces.append(Piece(False, False, x, line_index, 'h'))
+            elif ch == char_single:
+                pieces.append(Piece(False, True, x, line_index, None))
+            elif ch == char_goal:
+                if g_found == False:
+                    pieces.append(Piece(True, False, x, line_index, None))
+                    g_found = True
+        line_index += 1
+
+    board = Board(pieces)
+    
+    return board
+
+
+def read_puzzles(path):
+    """
+    Read the puzzles of a batch: every file of a directory, or the blank
+    line separated puzzles of a single file. Puzzles are read as they are
+    asked for, so a large file is never held in memory.
+
+    :param path: The directory or file.
+    :type path: str
+    :return: A generator of the name and lines of each puzzle.
+    :rtype: Iterator[Tuple[str, List[str]]]
+    """
+
+    if os.path.isdir(path):
+        for filename in sorted(os.listdir(path)):
+            full_path = os.path.join(path, filename)
+            if os.path.isfile(full_path):
+                with open(full_path, "r") as puzzle_file:
+                    yield os.path.splitext(filename)[0], puzzle_file.read().splitlines()
+        return
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    block = []
+    number = 0
+    with open(path, "r") as puzzle_file:
+        for line in puzzle_file:
+            if line.strip():
+                block.append(line.rstrip('\n'))
+            elif block:
+                number += 1
+                yield '{}_{}'.format(stem, number), block
+                block = []
+    if block:
+        yield '{}_{}'.format(stem, number + 1), block
+
+
+def get_solution(state):
+    """
+    Get the solution path from the given state.
+
+    :param state: The given state.
+    :type state: State
+    :return: A list of states from the initial state to the given state, or
+        a generator replaying them for a state of a NodeTable.
+    :rtype: Iterable[State]
+    """
+    if state.nodes is not None:
+        return state.nodes.replay(state.node)
+    solution = [state]
+    while state.parent != None:
+        state = state.parent
+        solution.append(state)
+    solution.reverse()
+    return solution
+
+
+
+def peak_memory():
+    """
+    The peak resident memory of this process.
+
+    :return: The peak memory in kilobytes, or None if it is not available.
+    :rtype: Optional[int]
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class SearchStats:
+    """
+    Counters and phase timings of a search, see --stats. A search given a
+    SearchStats expands states through expand() and reaches its open list
+    through push() and pop(), which is slower than the plain search.
+
+    The successors phase covers both move generation and board 
+    construction, as the successor generators build each board as soon as
+    they find its move; states is the construction of the State wrappers.
+    """
+
+    phases = ('successors', 'states', 'heuristic', 'heap')
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.depth = None
+        self.timings = dict.fromkeys(self.phases, 0.0)
+        self.start = time.perf_counter()
+        self.elapsed = None
+
+    def expand(self, state, heuristic=None):
+        """
+        Find the successors of a state, like State.available_moves() without
+        a heuristic and State.available_moves_manhattan() with one.
+
+        :param state: The state to expand.
+        :type state: State
+        :param heuristic: The heuristic setting the f value of the successors.
+        :type heuristic: Optional[Heuristic]
+        :return: The successor states.
+        :rtype: List[State]
+        """
+        timings = self.timings
+        depth = state.depth + 1
+
+        start = time.perf_counter()
+        moves = list(state.successors())
+        generated = time.perf_counter()
+        if heuristic is None:
+            hs = [None] * len(moves)
+            fs = [state.f] * len(moves)
+        else:
+            if state.h is None:
+                state.h = heuristic.evaluate(state.board)
+            hs = [heuristic.update(state.h, board, move) for board, move in moves]
+            fs = [depth + heuristic.value(h) for h in hs]
+        evaluated = time.perf_counter()
+        nodes = state.nodes
+        if nodes is None:
+            children = [State(board, f, depth, state, h) \
+                for (board, _), f, h in zip(moves, fs, hs)]
+        else:
+            children = [State(board, f, depth, None, h, nodes, nodes.add(state.node, 
+                move)) for (board, move), f, h in zip(moves, fs, hs)]
+        end = time.perf_counter()
+
+        timings['successors'] += generated - start
+        timings['heuristic'] += evaluated - generated
+        timings['states'] += end - evaluated
+        self.expanded += 1
+        self.generated += len(children)
+        return children
+
+    def push(self, frontier, state):
+        """
+        Push a state onto a BucketQueue frontier, counting it as a duplicate
+        when its board is already queued at most as deep.
+        """
+        start = time.perf_counter()
+        pushed = frontier.push(state)
+        self.timings['heap'] += time.perf_counter() - start
+        if not pushed:
+            self.duplicates += 1
+        elif len(frontier) > self.max_frontier:
+            self.max_frontier = len(frontier)
+
+    def pop(self, frontier):
+        """
+        Pop the next state of a BucketQueue frontier.
+        """
+        start = time.perf_counter()
+        state = frontier.pop()
+        self.timings['heap'] += time.perf_counter() - start
+        return state
+
+    def finish(self, state):
+        """
+        Stop the clock at the end of the search.
+
+        :param state: The solution state, or None.
+        :type state: Optional[State]
+        """
+        self.elapsed = time.perf_counter() - self.start
+        self.depth = state.depth if state is not None else None
+
+    def branching_factor(self):
+        """
+        The effective branching factor: the b of a uniform tree of the
+        solution depth with as many nodes as were generated, that is
+        N + 1 = 1 + b + b^2 + ... + b^d.
+
+        :return: The branching factor, or None without a solution.
+        :rtype: Optional[float]
+        """
+        if not self.depth:
+            return None
+        nodes = self.generated + 1
+
+        def tree_size(b):
+            return sum(b ** i for i in range(self.depth + 1))
+
+        # b^d <= N + 1
+        low, high = 1.0, nodes ** (1.0 / self.depth)
+        for _ in range(100):
+            mid = (low + high) / 2
+            if tree_size(mid) < nodes:
+                low = mid
+            else:
+                high = mid
+        return round(low, 4)
+
+    def report(self):
+        """
+        The statistics as a JSON serializable dict.
+
+        :rtype: Dict[str, Any]
+        """
+        return {
+            'solution_depth': self.depth,
+            'nodes_expanded': self.expanded,
+            'nodes_generated': self.generated,
+            'duplicates_pruned': self.duplicates,
+            'max_frontier': self.max_frontier,
+            'peak_memory_kb': peak_memory(),
+            'effective_branching_factor': self.branching_factor(),
+            'seconds': dict(self.timings, total=self.elapsed),
+        }
+
+
+def DFS(state, explored=None, stats=None):
+    """
+    Depth-first search algorithm recursively.
+
+    :param state: The initial state.
+    :type state: State
+    :param explored: The closed list to use, a fresh ClosedSet by default.
+    :type explored: Optional[ClosedSet]
+    :param stats: Statistics to collect, see SearchStats.
+    :type stats: Optional[SearchStats]
+    :return: A solution state.
+    :rtype: State
+    """
+    frontier = [state]
+    if explored is None:
+        explored = ClosedSet()
+    # state.board.display()
+    # print("\n")
+    while frontier:
+        if stats is not None and len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+        curr = frontier.pop()
+        if curr.key not in explored:
+            
+
+            # print(state.board.display())
+            # state.board.display()
+            # print('------\n')
+            # input()
+            explored.add(curr.key)
+            # print('explored: ', explored)
+
+            if curr.board.goal_check():
+                # print("\n\nhihi\n")
+                return curr
+
+
+
+            children = curr.available_moves() if stats is None else stats.expand(curr)
+            for child in children:
+                # print("\n\nhihi\n")
+                # child.board.display()
+                # print('\n')
+                # print(child)
+                # print('child id: ', child.id)
+                if child.key not in explored:
+                    frontier.append(child)
+                    # print('frontier: ', frontier)
+                elif stats is not None:
+                    stats.duplicates += 1
+            # print('end------\n')
+        elif stats is not None:
+            stats.duplicates += 1
+        
+
+
+def As_Man(state, explored=None, heuristic=None, stats=None, cache=None):
+    """
+    A* algorithm with Manhattan distance as heuristic.
+
+    The open list is a BucketQueue, so among states of equal f the deepest
+    is expanded first.
+
+    With a cache, a state whose board is in the cache goes back on the open
+    list with its exact f value; when it comes off again no shorter solution
+    is left, and the cached path finishes the search. The cached keys are
+    read once, so only boards in the cache are looked up in the database.
+
+    :param state: The initial state.
+    :type state: State
+    :param explored: The closed list to use, a fresh ClosedSet by default.
+    :type explored: Optional[ClosedSet]
+    :param heuristic: A heuristic to use instead of the Manhattan distance,
+        see heuristics.
+    :type heuristic: Optional[Heuristic]
+    :param stats: Statistics to collect, see SearchStats.
+    :type stats: Optional[SearchStats]
+    :param cache: Solutions of earlier runs.
+    :type cache: Optional[SolutionCache]
+    :return: A solution state.
+    :rtype: State
+    """
+    frontier = BucketQueue()
+    frontier.push(state)
+    if explored is None:
+        explored = ClosedSet()
+    if stats is not None and heuristic is None:
+        heuristic = heuristics['manhattan']()
+    exact = set()  # states whose f is their cached distance
+    cached = cache.keys() if cache is not None else ()
+
+
+    while frontier:
+        curr = frontier.pop() if stats is None else stats.pop(frontier)
+
+
+        if curr.key not in explored:
+            if curr.key in cached:
+                if curr in exact:
+                    return cache.complete(curr)
+                curr.f = curr.depth + cache.lookup(curr.board)[0]
+                exact.add(curr)
+                frontier.push(curr)
+                continue
+
+            explored.add(curr.key)
+            
+            if curr.board.goal_check():
+                return curr
+            if stats is None:
+                for child in curr.available_moves_manhattan(heuristic):
+                    if child.key not in explored:
+                        frontier.push(child)
+            else:
+                for child in stats.expand(curr, heuristic):
+                    if child.key not in explored:
+                        stats.push(frontier, child)
+                    else:
+                        stats.duplicates += 1
+        elif stats is not None:
+            stats.duplicates += 1
+    return None
+
+
+
+
+def IDA_star(state, heuristic=None, limit=1000000):
+    """
+    Iterative deepening A*: depth-first searches bounded by an increasing f
+    threshold. Only the current path and its pending successor generators 
+    are kept, plus a table of at most limit boards with the smallest depth
+    they were reached at in the current iteration, so transpositions reached
+    again no shallower are not searched twice.
+
+    :param state: The initial state.
+    :type state: State
+    :param heuristic: The heuristic, Manhattan distance by default.
+    :type heuristic: Optional[Heuristic]
+    :param limit: The maximum number of boards in the transposition table.
+    :type limit: int
+    :return: A solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    if heuristic is None:
+        heuristic = heuristics['manhattan']()
+    state.h = heuristic.evaluate(state.board)
+    state.f = state.depth + heuristic.value(state.h)
+    threshold = state.f
+
+    while True:
+        next_threshold = None
+        seen = {state.key: state.depth}
+        on_path = {state.key}
+        stack = [(state, state.available_moves_manhattan(heuristic))]
+        if state.board.goal_check():
+            return state
+
+        while stack:
+            curr, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(curr.key)
+                continue
+            if child.key in on_path:
+                continue
+            if child.f > threshold:
+                if next_threshold is None or child.f < next_threshold:
+                    next_threshold = child.f
+                continue
+            if child.board.goal_check():
+                return child
+            depth = seen.get(child.key)
+            if depth is not None and depth <= child.depth:
+                continue
+            if depth is not None or len(seen) < limit:
+                seen[child.key] = child.depth
+            on_path.add(child.key)
+            stack.append((child, child.available_moves_manhattan(heuristic)))
+
+        if next_threshold is None:
+            return None
+        threshold = next_threshold
+
+
+
+def ID_DFS(state, limit=1000000):
+    """
+    Iterative deepening depth-first search: depth-first searches bounded by
+    a depth that grows by one, so the first solution is a shortest one. 
+    Only the current path and its pending successor generators are kept, 
+    plus a TranspositionTable of limit slots cleared at every depth, so 
+    boards reached again no shallower are mostly not searched twice.
+
+    :param state: The initial state.
+    :type state: State
+    :param limit: The number of slots of the transposition table.
+    :type limit: int
+    :return: A solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    if state.board.goal_check():
+        return state
+    table = TranspositionTable(limit)
+
+    bound = state.depth + 1
+    while True:
+        table.clear()
+        table.add(state.key, state.depth)
+        on_path = {state.key}
+        stack = [(state, state.available_moves())]
+        cut = False  # whether the bound stopped the search anywhere
+
+        while stack:
+            curr, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                on_path.discard(curr.key)
+                continue
+            if child.key in on_path or table.reached(child.key, child.depth):
+                continue
+            if child.board.goal_check():
+                return child
+            if child.depth >= bound:
+                cut = True
+                continue
+            table.add(child.key, child.depth)
+            on_path.add(child.key)
+            stack.append((child, child.available_moves()))
+
+        if not cut:
+            return None
+        bound += 1
+
+
+
+class SMAState(State):
+    """
+    A state of SMA_star(), with its bookkeeping.
+    """
+
+    __slots__ = ('children', 'forgotten', 'is_leaf', 'backed')
+
+
+def SMA_star(state, heuristic=None, limit=1000000):
+    """
+    Simplified memory-bounded A*. Works like A* until limit states are in 
+    memory, then forgets the worst leaf (highest f, shallowest) and backs 
+    its f value up into its parent, which goes back on the open list so the
+    forgotten successors can be generated again when they look best. 
+    Successors get at least their parent's f (pathmax). The solution is 
+    optimal if limit is at least the number of states on it and their 
+    siblings. A path of more than limit states cannot be kept, so states 
+    that cannot reach the goal within depth limit - 1 (by the admissible 
+    heuristic) are not generated, and the search fails when every solution
+    is deeper. A state remembers the backed up f of each forgotten 
+    successor, at most one per move, and generates it again with that f,
+    or not at all if it was a dead end, so a small limit cannot make the 
+    search regenerate the same successors forever. It still terminates 
+    slowly when limit is well below the number of states A* would keep, as
+    most of the work is then spent generating forgotten states again; 
+    IDA_star() suits such a limit better.
+
+    :param state: The initial state.
+    :type state: State
+    :param heuristic: The heuristic, Manhattan distance by default.
+    :type heuristic: Optional[Heuristic]
+    :param limit: The maximum number of states kept in memory.
+    :type limit: int
+    :return: A solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    if heuristic is None:
+        heuristic = heuristics['manhattan']()
+    infinity = float('inf')
+    counter = count()
+    state = SMAState(state.board, state.f, state.depth, state.parent)
+    state.h = heuristic.evaluate(state.board)
+    state.f = state.depth + heuristic.value(state.h)
+
+    # The newest state in memory for each key. A state is a leaf while it
+    # has no children in memory; only leaves can be forgotten, so they are
+    # also on the worst heap. An expanded state is back on the best heap, 
+    # keyed by the least backed up f, while some of its children are 
+    # forgotten. A state reached again by a shorter path after expansion is
+    # superseded but kept for its children, and forgotten once they are.
+    # Both heaps use lazy deletion, and are compacted when their stale 
+    # entries outnumber the states in memory.
+    nodes = {}
+    size = 0
+    best = []
+    worst = []
+
+    def add_leaf(leaf):
+        nonlocal size
+        leaf.children = 0
+        leaf.forgotten = infinity
+        leaf.is_leaf = True
+        leaf.backed = None
+        nodes[leaf.key] = leaf
+        size += 1
+        heappush(best, (leaf.f, -leaf.depth, next(counter), leaf))
+        heappush(worst, (-leaf.f, leaf.depth, next(counter), leaf))
+
+    def is_current(node, f):
+        return nodes.get(node.key) is node \
+            and (node.f if node.is_leaf else node.forgotten) == f
+
+    def compact():
+        nonlocal best, worst
+        kept = set()
+        live = []
+        for entry in best:
+            node = entry[3]
+            if id(node) not in kept and is_current(node, entry[0]):
+                kept.add(id(node))
+                live.append(entry)
+        best = live
+        heapify(best)
+        kept = set()
+        live = []
+        for entry in worst:
+            node = entry[3]
+            if id(node) not in kept and node.is_leaf and is_current(node, -entry[0]):
+                kept.add(id(node))
+                live.append(entry)
+        worst = live
+        heapify(worst)
+
+    def forget(leaf):
+        nonlocal size
+        while True:
+            if nodes.get(leaf.key) is leaf:
+                del nodes[leaf.key]
+            leaf.is_leaf = False
+            size -= 1
+            parent = leaf.parent
+            parent.children -= 1
+            if parent.backed is None:
+                parent.backed = {}
+            parent.backed[leaf.key] = leaf.f
+            parent.forgotten = min(parent.forgotten, leaf.f)
+            if parent.children > 0:
+                heappush(best, (parent.forgotten, -parent.depth, next(counter), parent))
+                return
+            parent.f = max(parent.f, parent.forgotten)
+            if nodes.get(parent.key) is not parent and parent.parent is not None:
+                leaf = parent
+                continue
+            parent.is_leaf = True
+            heappush(best, (parent.f, -parent.depth, next(counter), parent))
+            heappush(worst, (-parent.f, parent.depth, next(counter), parent))
+            return
+
+    add_leaf(state)
+    while best:
+        f, _, _, curr = heappop(best)
+        if not is_current(curr, f):
+            continue
+        if f == infinity:
+            return None
+        if curr.is_leaf and curr.board.goal_check():
+            return curr
+
+        curr.is_leaf = False
+        curr.forgotten = infinity
+        for child in curr.available_moves_manhattan(heuristic):
+            if child.depth + heuristic.value(child.h) > limit - 1:
+                # no room for the rest of its path to the goal
+                continue
+            if curr.backed is not None and child.key in curr.backed:
+                backed = curr.backed[child.key]
+                if backed == infinity:
+                    continue
+                child.f = max(child.f, backed)
+            other = nodes.get(child.key)
+            if other is not None:
+                if other.parent is curr or other.depth <= child.depth:
+                    continue
+                if other.is_leaf:
+                    forget(other)
+            child.f = max(child.f, f)
+            add_leaf(child)
+            curr.children += 1
+        if curr.children == 0:
+            # a dead end, forgotten first
+            curr.f = infinity
+            curr.is_leaf = True
+            heappush(worst, (-curr.f, curr.depth, next(counter), curr))
+
+        while size > limit and worst:
+            negf, _, _, leaf = heappop(worst)
+            if leaf.is_leaf and is_current(leaf, -negf) and leaf.parent is not None:
+                forget(leaf)
+        if len(best) + len(worst) > 4 * size + 1000:
+            compact()
+    return None
+
+
+
+
+def ARA_star(state, heuristic=None, weight=3.0, time_limit=None, report=None):
+    """
+    Anytime repairing A*: weighted A* (f = g + weight * h) that finds a
+    solution fast, then lowers the weight by ara_weight_step and carries on
+    with the same open list for better solutions, down to weight 1 where the
+    solution is optimal. A state reached by a shorter path after it was
+    expanded waits in an inconsistent list until the next weight instead of
+    being expanded again, and states that cannot beat the best solution
+    (g + h at least its length) are dropped.
+
+    :param state: The initial state.
+    :type state: State
+    :param heuristic: The heuristic, Manhattan distance by default.
+    :type heuristic: Optional[Heuristic]
+    :param weight: The first weight, at least 1.
+    :type weight: float
+    :param time_limit: Stop with the best solution so far after this many
+        seconds, once there is one. None searches until the solution is
+        optimal.
+    :type time_limit: Optional[float]
+    :param report: Called with each better solution state and the weight
+        it was found with.
+    :type report: Optional[Callable[[State, float], None]]
+    :return: The best solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    if heuristic is None:
+        heuristic = heuristics['manhattan']()
+    deadline = None if time_limit is None else time.time() + time_limit
+    if state.h is None:
+        state.h = heuristic.evaluate(state.board)
+
+    best = {state.key: state}  # the state of the shortest path to each key
+    closed = set()
+    inconsistent = {}
+    frontier = []
+    counter = count()
+    goal = state if state.board.goal_check() else None
+    expanded = 0
+
+    def push(s):
+        heappush(frontier, (s.depth + weight * heuristic.value(s.h), next(counter), s))
+
+    push(state)
+    while True:
+        while frontier and (goal is None or frontier[0][0] < goal.depth):
+            curr = heappop(frontier)[2]
+            if best[curr.key] is not curr or curr.key in closed:
+                continue
+            closed.add(curr.key)
+
+            expanded += 1
+            if deadline is not None and goal is not None \
+                    and expanded % ara_check_every == 0 and time.time() > deadline:
+                return goal
+
+            for child in curr.available_moves_manhattan(heuristic):
+                old = best.get(child.key)
+                if old is not None and old.depth <= child.depth:
+                    continue
+                if goal is not None and child.depth + heuristic.value(child.h) >= goal.depth:
+                    continue
+                best[child.key] = child
+                if child.board.goal_check():
+                    goal = child
+                    if report is not None:
+                        report(goal, weight)
+                elif child.key in closed:
+                    inconsistent[child.key] = child
+                else:
+                    push(child)
+
+        if weight <= 1 or goal is None:
+            return goal
+
+        # the next weight reorders the open list and the inconsistent states
+        weight = max(1.0, weight - ara_weight_step)
+        states = [entry[2] for entry in frontier if best[entry[2].key] is entry[2]]
+        states += inconsistent.values()
+        frontier = []
+        for s in states:
+            if s.depth + heuristic.value(s.h) < goal.depth:
+                push(s)
+        inconsistent = {}
+        closed = set()
+
+
+
+
+def bidirectional_BFS(board):
+    """
+    Bidirectional breadth-first search for a shortest solution. Layers are
+    expanded alternately forward from the board and backward from every 
+    goal board (moves are reversible, so both use the same move generator),
+    whichever frontier is smaller, until a layer reaches a board seen by the
+    other side. The goal boards are streamed from goal_layouts() while the
+    first backward layer is expanded, so they are never listed up front.
+
+    :param board: The initial board.
+    :type board: Union[Board, BitBoard]
+    :return: A solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    start = board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+    if start.goal_check():
+        return State(start, 0, 0, None)
+
+    # Each side maps the keys it has seen to (next key towards its root, depth).
+    forward = {start.key(): (None, 0)}
+    backward = {}
+    forward_frontier = [start]
+    backward_frontier = None
+    forward_depth = backward_depth = 0
+
+    def expand(frontier, seen, other, depth):
+        """
+        Expand one layer, returning the next layer and the best meeting
+        key and length found (or None and None).
+        """
+        next_frontier = []
+        meet = length = None
+        for board in frontier:
+            parent = board.key()
+            for child, _ in board.successors():
+                key = child.key()
+                if key in seen:
+                    continue
+                seen[key] = (parent, depth + 1)
+                next_frontier.append(child)
+                if key in other:
+                    total = depth + 1 + other[key][1]
+                    if length is None or total < length:
+                        meet, length = key, total
+        return next_frontier, meet, length
+
+    while forward_frontier and (backward_frontier is None or backward_frontier):
+        if backward_frontier is not None and len(backward_frontier) < len(forward_frontier):
+            backward_frontier, meet, _ = expand(backward_frontier, backward, forward, 
+                backward_depth)
+            backward_depth += 1
+        elif backward_frontier is None and forward_depth > 0:
+            def goals():
+                for goal in goal_layouts(bit_count(start.horiz), 
+                        bit_count(start.vert), bit_count(start.singles)):
+                    # may overwrite the depth 1 entry of a goal reached 
+                    # from one streamed earlier
+                    backward[goal.key()] = (None, 0)
+                    yield goal
+            backward_frontier, meet, _ = expand(goals(), backward, forward, 0)
+            backward_depth = 1
+        else:
+            forward_frontier, meet, _ = expand(forward_frontier, forward, backward, 
+                forward_depth)
+            forward_depth += 1
+            if meet is None and backward_frontier is None:
+                meet = next((child.key() for child in forward_frontier \
+                    if child.goal_check()), None)
+        if meet is not None:
+            break
+    else:
+        return None
+
+    path = []
+    key = meet
+    while key is not None:
+        path.append(key)
+        key = forward[key][0]
+    path.reverse()
+    key = backward[meet][0] if meet in backward else None
+    while key is not None:
+        path.append(key)
+        key = backward[key][0]
+
+    state = None
+    for depth, key in enumerate(path):
+        state = State(BitBoard.from_key(key), depth, depth, state)
+    return state
+
+
+
+
+def hda_owner(key, workers):
+    """
+    The worker owning a board in parallel A*.
+
+    :param key: The closed list key of the board.
+    :type key: int
+    :param workers: The number of workers.
+    :type workers: int
+    :return: The index of the owning worker.
+    :rtype: int
+    """
+    # scramble the key so that neighbouring boards spread over the workers
+    return (((key * 0x9e3779b97f4a7c15) & 0xffffffffffffffff) >> 32) % workers
+
+
+def hda_worker(index, heuristic, symmetric, inboxes, sent, received, idle, 
+        incumbent, goal, results):
+    """
+    A worker process of HDA_star(). It runs A* on the boards it owns, sends
+    the successors owned by other workers to their inboxes in batches and,
+    once the search is over, answers trace requests for the solution path.
+
+    Inbox messages are ('nodes', [(depth, key, parent key, h), ...]),
+    ('trace', key) and ('done', None).
+
+    :param index: The index of this worker.
+    :type index: int
+    :param heuristic: The heuristic of the search.
+    :type heuristic: Heuristic
+    :param symmetric: Whether mirror images share a closed list key.
+    :type symmetric: bool
+    :param inboxes: The inbox of every worker.
+    :type inboxes: List[Queue]
+    :param sent: The number of node batches put by each worker.
+    :type sent: Array
+    :param received: The number of node batches taken by each worker.
+    :type received: Array
+    :param idle: Whether each worker has nothing left to expand.
+    :type idle: Array
+    :param incumbent: The number of moves of the best solution so far.
+    :type incumbent: Value
+    :param goal: The board key of the best solution so far.
+    :type goal: Value
+    :param results: The queue answering trace requests.
+    :type results: Queue
+    """
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    outboxes = [[] for _ in range(workers)]
+    frontier = []
+    best = {}  # closed list key -> (depth, board key, parent board key)
+    expanded = {}  # closed list key -> depth it was expanded at
+    tie = count()
+
+    def add(nodes):
+        for depth, key, parent, h in nodes:
+            dedup = BitBoard.from_key(key).canonical_key() if symmetric else key
+            old = best.get(dedup)
+            if old is None or depth < old[0]:
+                best[dedup] = (depth, key, parent)
+                heappush(frontier, (depth + heuristic.value(h), next(tie), depth, 
+                    key, h))
+
+    def flush():
+        for i in range(workers):
+            if outboxes[i]:
+                sent[index] += 1
+                inboxes[i].put(('nodes', outboxes[i]))
+                outboxes[i] = []
+
+    while True:
+        bound = incumbent.value
+        if frontier and frontier[0][0] < bound:
+            try:
+                message = inbox.get_nowait()
+            except Empty:
+                message = None
+        else:
+            flush()
+            idle[index] = 1
+            message = inbox.get()
+
+        if message is not None:
+            kind, data = message
+            if kind == 'nodes':
+                idle[index] = 0
+                add(data)
+                received[index] += 1
+            elif kind == 'trace':
+                dedup = BitBoard.from_key(data).canonical_key() if symmetric else data
+                results.put(best[dedup])
+            else:
+                return
+            continue
+
+        for _ in range(hda_burst):
+            if not frontier or frontier[0][0] >= bound:
+                break
+            f, _, depth, key, h = heappop(frontier)
+            board = BitBoard.from_key(key)
+            dedup = board.canonical_key() if symmetric else key
+            if best[dedup][0] < depth or expanded.get(dedup, bound) <= depth:
+                continue
+            expanded[dedup] = depth
+
+            if board.goal_check():
+                with incumbent.get_lock():
+                    if depth < incumbent.value:
+                        incumbent.value = depth
+                        goal.value = key
+                bound = incumbent.value
+                continue
+            local = []
+            for child, move in board.successors():
+                child_h = heuristic.update(h, child, move)
+                if depth + 1 + heuristic.value(child_h) >= bound:
+                    continue
+                node = (depth + 1, child.key(), key, child_h)
+                owner = hda_owner(child.canonical_key() if symmetric else node[1], 
+                    workers)
+                if owner == index:
+                    local.append(node)
+                else:
+                    outboxes[owner].append(node)
+            add(local)
+        flush()
+
+
+def HDA_star(board, heuristic=None, workers=None):
+    """
+    Hash distributed A*: every board is owned by one of the worker processes,
+    chosen by a hash of its closed list key, and successors are passed to
+    their owners by message. A solution only bounds the search; the workers
+    keep expanding until no board with a smaller f value is left anywhere, so
+    the solution is optimal for an admissible heuristic.
+
+    The search is over when every worker is idle and every batch of nodes
+    sent has been received, seen twice in a row with the same counts, and
+    fails with a RuntimeError if a worker exits before that.
+
+    :param board: The initial board.
+    :type board: Board
+    :param heuristic: A heuristic to use instead of the Manhattan distance,
+        see heuristics.
+    :type heuristic: Optional[Heuristic]
+    :param workers: The number of worker processes, one per CPU by default.
+    :type workers: Optional[int]
+    :return: A solution state of BitBoards, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    if not isinstance(board, BitBoard):
+        board = BitBoard.from_board(board)
+    if heuristic is None:
+        heuristic = heuristics['manhattan']()
+    if workers is None:
+        workers = os.cpu_count()
+    symmetric = State.symmetric
+
+    inboxes = [Queue() for _ in range(workers)]
+    sent = Array('q', workers)
+    received = Array('q', workers)
+    idle = Array('b', workers)
+    incumbent = Value('q', 1 << 62)
+    goal = Value('Q', 0)
+    results = Queue()
+    processes = [Process(target=hda_worker, args=(i, heuristic, symmetric, inboxes, 
+        sent, received, idle, incumbent, goal, results)) for i in range(workers)]
+    for process in processes:
+        process.start()
+
+    # the initial board counts as one batch sent by this process
+    key = board.key()
+    owner = hda_owner(board.canonical_key() if symmetric else key, workers)
+    inboxes[owner].put(('nodes', [(0, key, None, heuristic.evaluate(board))]))
+
+    last = None
+    while True:
+        time.sleep(0.01)
+        for i, process in enumerate(processes):
+            if process.exitcode is not None:
+                # the boards of a dead worker are lost, and the others would 
+                # wait for them forever
+                for other in processes:
+                    other.terminate()
+                raise RuntimeError("parallel A* worker {} exited with code {}".format(
+                    i, process.exitcode))
+        snapshot = (idle[:], sent[:], received[:])
+        if all(snapshot[0]) and sum(snapshot[1]) + 1 == sum(snapshot[2]) \
+                and snapshot == last:
+            break
+        last = snapshot
+
+    path = []
+    if incumbent.value < 1 << 62:
+        # follow the parent keys back to the start, a step taken on a mirror
+        # image of the board mirrors the rest of the path
+        key = goal.value
+        while key is not None:
+            path.append(key)
+            dedup = BitBoard.from_key(key).canonical_key() if symmetric else key
+            inboxes[hda_owner(dedup, workers)].put(('trace', key))
+            _, reached, parent = results.get()
+            if parent is not None and reached != key:
+                parent = BitBoard.from_key(parent).mirror().key()
+            key = parent
+        path.reverse()
+
+    for inbox in inboxes:
+        inbox.put(('done', None))
+    for process in processes:
+        process.join()
+
+    if not path:
+        return None
+    state = None
+    for depth, key in enumerate(path):
+        state = State(BitBoard.from_key(key), depth, depth, state)
+    return state
+
+
+
+
+def solve(board, args, pdb=None, table=None, stats=None, cache=None, report=None):
+    """
+    Solve a board with the options given on the command line.
+
+    :param board: The initial board.
+    :type board: Union[Board, BitBoard]
+    :param args: The parsed command line options.
+    :type args: argparse.Namespace
+    :param pdb: The pattern database loaded from --pdb.
+    :type pdb: Optional[PatternDatabase]
+    :param table: The distance table loaded from --table.
+    :type table: Optional[DistanceTable]
+    :param stats: Statistics to collect for astar and dfs, see SearchStats.
+    :type stats: Optional[SearchStats]
+    :param cache: The solution cache opened from --cache. Solutions of the
+        algorithms in cached_algos are added to it.
+    :type cache: Optional[SolutionCache]
+    :param report: Called with each better solution found by ara, see
+        ARA_star().
+    :type report: Optional[Callable[[State, float], None]]
+    :return: A solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    if args.bitboard and not isinstance(board, BitBoard):
+        board = BitBoard.from_board(board)
+    elif not args.bitboard and isinstance(board, BitBoard):
+        board = board.to_board()
+
+    if cache is not None:
+        a = cache.solve(board)
+        if a is not None:
+            return a
+
+    if table is not None:
+        a = table.solve(board)
+        if a is not None:
+            return a
+
+    if pdb is not None and not pdb.matches(BitBoard.from_board(board) \
+            if not isinstance(board, BitBoard) else board):
+        raise ValueError("the pattern database was built for other pieces")
+    heuristic = heuristics[args.heuristic](pdb)
+
+    start = NodeTable(board).root() if args.compact else State(board, 0, 0, None)
+    if args.algo == 'astar':
+        a = As_Man(start, make_closed_set(args.closed_limit), heuristic, stats, cache)
+    elif args.algo == 'dfs':
+        return DFS(start, make_closed_set(args.closed_limit), stats)
+    elif args.algo == 'ida':
+        a = IDA_star(State(board, 0, 0, None), heuristic, args.memory)
+    elif args.algo == 'iddfs':
+        a = ID_DFS(State(board, 0, 0, None), args.memory)
+    elif args.algo == 'smastar':
+        a = SMA_star(State(board, 0, 0, None), heuristic, args.memory)
+    elif args.algo == 'bibfs':
+        a = bidirectional_BFS(board)
+    elif args.algo == 'hda':
+        a = HDA_star(board, heuristic, args.jobs)
+    elif args.algo == 'ara':
+        a = ARA_star(State(board, 0, 0, None), heuristic, args.weight, args.time_limit,
+            report)
+
+    if cache is not None and a is not None and args.algo in cached_algos:
+        cache.store(get_solution(a))
+    return a
+
+
+
+# The options, pattern database, distance table and solution cache of a batch
+# worker process.
+batch_worker = {}
+
+
+def init_batch_worker(args):
+    """
+    Set up a batch worker process, loading the files it needs once.
+
+    :param args: The parsed command line options.
+    :type args: argparse.Namespace
+    """
+    State.symmetric = args.symmetry
+    State.macro = args.macro_moves
+    batch_worker['args'] = args
+    batch_worker['pdb'] = PatternDatabase.load(args.pdb) if args.pdb else None
+    batch_worker['table'] = DistanceTable(args.table) if args.table else None
+    batch_worker['cache'] = SolutionCache(args.cache) if args.cache else None
+
+
+def solve_batch_puzzle(task):
+    """
+    Solve one puzzle of a batch in a worker and write its solution file.
+
+    :param task: The name, lines and output file name of the puzzle.
+    :type task: Tuple[str, List[str], str]
+    :return: The name of the puzzle, the number of moves (None if it was 
+        not solved) and the time taken or the reason it was not solved.
+    :rtype: Tuple[str, Optional[int], Union[float, str]]
+    """
+    name, lines, filename = task
+    args = batch_worker['args']
+    start = time.time()
+    try:
+        board = BitBoard.from_lines(lines) if args.bitboard else read_from_lines(lines)
+        a = solve(board, args, batch_worker['pdb'], batch_worker['table'], 
+            cache=batch_worker['cache'])
+    except ValueError as e:
+        return name, None, str(e)
+    if a is None:
+        return name, None, "no solution"
+    output_solution(filename, a)
+    return name, a.depth, time.time() - start
+
+
+def solve_batch(args):
+    """
+    Solve every puzzle of args.inputfile (see read_puzzles()) with a pool of
+    args.jobs worker processes, writing each solution to its own file in the
+    args.outputfile directory as soon as it is found.
+
+    :param args: The parsed command line options.
+    :type args: argparse.Namespace
+    """
+    os.makedirs(args.outputfile, exist_ok=True)
+    tasks = ((name, lines, os.path.join(args.outputfile, 
+        '{}sol_{}.txt'.format(name, args.algo))) \
+        for name, lines in read_puzzles(args.inputfile))
+
+    with Pool(args.jobs, init_batch_worker, (args,)) as pool:
+        for name, moves, info in pool.imap_unordered(solve_batch_puzzle, tasks):
+            if moves is None:
+                print('{}: {}'.format(name, info))
+            else:
+                print('{}: {} moves in {:.2f}s'.format(name, moves, info))
+
+
+
+def output_to_file(filename, solution):
+    """
+    Output the solution to a given file.
+
+    :param filename: The name of the given file.
+    :type filename: str
+    :param solution: The solution path, written as it is iterated.
+    :type solution: Iterable[State]
+    """
+    with open(filename, "w", buffering=output_buffer) as output_file:
+        output_file.writelines(state.board.display_string() + "\n" for state in solution)
+
+
+def output_solution(filename, state):
+    """
+    Output the solution path to a state to a given file. Paths of BitBoards
+    and of a NodeTable are drawn from their packed boards (see render_key()),
+    the latter without building a State or Board per step.
+
+    :param filename: The name of the given file.
+    :type filename: str
+    :param state: The solution state.
+    :type state: State
+    """
+    if state.nodes is not None:
+        keys = state.nodes.replay_keys(state.node)
+    elif isinstance(state.board, BitBoard):
+        keys = [s.board.key() for s in get_solution(state)]
+    else:
+        output_to_file(filename, get_solution(state))
+        return
+    with open(filename, "w", buffering=output_buffer) as output_file:
+        output_file.writelines(render_key(key) + "\n" for key in keys)
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--inputfile",
+        type=str,
+        required=True,
+        help="The input file that contains the puzzle."
+    )
+    parser.add_argument(
+        "--outputfile",
+        type=str,
+        required=True,
+        help="The output file that contains the solution."
+    )
+    parser.add_argument(
+        "--algo",
+        type=str,
+        required=True,
+        choices=['astar', 'dfs', 'ida', 'iddfs', 'smastar', 'bibfs', 'hda', 'ara'],
+        help="The searching algorithm."
+    )
+    parser.add_argument(
+        "--bitboard",
+        action="store_true",
+        help="Search on the compact bit-packed board encoding."
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Keep the astar and dfs search tree as a move log instead of "
+            "parent states."
+    )
+    parser.add_argument(
+        "--closed-limit",
+        type=int,
+        default=None,
+        help="Keep at most this many boards in the closed list. Only for "
+            "astar, as dfs can loop forever between forgotten boards."
+    )
+    parser.add_argument(
+        "--symmetry",
+        action="store_true",
+        help="Treat mirror image boards as the same state."
+    )
+    parser.add_argument(
+        "--macro-moves",
+        action="store_true",
+        help="Count a slide of one piece over several cells, around corners "
+            "included, as one move. Uses the macro heuristic."
+    )
+    parser.add_argument(
+        "--pdb",
+        type=str,
+        default=None,
+        help="A pattern database built by hrd_pdb.py to use as the A* heuristic."
+    )
+    parser.add_argument(
+        "--heuristic",
+        type=str,
+        default=None,
+        choices=sorted(heuristics),
+        help="The A* heuristic, pdb when --pdb is given, macro with "
+            "--macro-moves and manhattan otherwise."
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        default=1000000,
+        help="The most states kept by smastar, or transpositions kept by ida "
+            "and iddfs. smastar slows down sharply once this is below the "
+            "number of states astar keeps, taking minutes even on medium "
+            "puzzles; use ida for a budget that small."
+    )
+    parser.add_argument(
+        "--table",
+        type=str,
+        default=None,
+        help="A distance table built by hrd_table.py; boards found in it are "
+            "solved by lookup instead of by --algo."
+    )
+    parser.add_argument(
+        "--weight",
+        type=float,
+        default=3.0,
+        help="The first heuristic weight of ara."
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Stop ara with its best solution after this many seconds. The "
+            "output file is rewritten with every better solution."
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        help="An sqlite file of optimal solutions kept across runs. A board "
+            "on a cached solution is answered from it, astar stops as soon as "
+            "it reaches one, and solutions found by astar, bibfs, ida, iddfs "
+            "and hda are added to it."
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Solve every puzzle in the --inputfile directory, or every blank "
+            "line separated puzzle in the --inputfile file, writing the "
+            "solutions to the --outputfile directory."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="The number of worker processes in batch mode, or of the "
+            "parallel A* search."
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        help="Write the search statistics as JSON to this file, or to the "
+            "standard output without a file name. Only for astar and dfs."
+    )
+    args = parser.parse_args()
+    State.symmetric = args.symmetry
+    State.macro = args.macro_moves
+
+    if args.macro_moves:
+        # the pdb, table and cache hold distances in single steps, which 
+        # overestimate slides
+        if args.pdb is not None or args.table is not None or args.cache is not None:
+            parser.error("--macro-moves cannot use --pdb, --table or --cache")
+        if args.heuristic not in (None, 'macro'):
+            parser.error("--heuristic {} overestimates with --macro-moves, use "
+                "macro".format(args.heuristic))
+        if args.algo in ('bibfs', 'hda') or args.compact:
+            parser.error("--macro-moves needs --algo astar, dfs, ida, iddfs, smastar "
+                "or ara without --compact")
+        args.heuristic = 'macro'
+
+    if args.heuristic is None:
+        args.heuristic = 'manhattan' if args.pdb is None else 'pdb'
+    if args.heuristic == 'pdb' and args.pdb is None:
+        parser.error("--heuristic pdb needs --pdb")
+
+    if args.closed_limit is not None and args.algo != 'astar':
+        parser.error("--closed-limit needs --algo astar")
+    if args.closed_limit is not None and args.closed_limit < 1:
+        parser.error("--closed-limit must be at least 1")
+    if args.memory < 1:
+        parser.error("--memory must be at least 1")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.weight < 1:
+        parser.error("--weight must be at least 1")
+    if args.batch and os.path.isfile(args.outputfile):
+        parser.error("--outputfile must be a directory in --batch mode")
+    if args.batch and args.algo == 'hda':
+        parser.error("--algo hda cannot run in --batch mode")
+
+    if args.stats is not None and (args.batch or args.algo not in ('astar', 'dfs')):
+        parser.error("--stats needs a single puzzle and --algo astar or dfs")
+
+    if args.batch:
+        solve_batch(args)
+
+    else:
+        # read the board from the file
+        board = read_from_file(args.inputfile)
+
+        pdb = PatternDatabase.load(args.pdb) if args.pdb is not None else None
+        table = DistanceTable(args.table) if args.table is not None else None
+        cache = SolutionCache(args.cache) if args.cache is not None else None
+
+        # solve the puzzle
+        stats = SearchStats() if args.stats is not None else None
+
+        def report(state, weight):
+            output_solution(args.outputfile, state)
+            print('{} moves with weight {}'.format(state.depth, weight))
+
+        try:
+            a = solve(board, args, pdb, table, stats, cache, report)
+        except ValueError as e:
+            parser.error(str(e))
+        if stats is not None:
+            stats.finish(a)
+            if args.stats == "-":
+                print(json.dumps(stats.report(), indent=4))
+            else:
+                with open(args.stats, "w") as stats_file:
+                    json.dump(stats.report(), stats_file, indent=4)
+        if table is not None:
+            table.close()
+        if cache is not None:
+            cache.close()
+        if a is None:
+            # no solution, or the search gave up within its memory or time
+            print('no solution')
+            sys.exit(1)
+        output_solution(args.outputfile, a)
         
     # print(a.depth)
     #board.display()
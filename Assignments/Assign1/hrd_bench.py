@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from queue import Empty
+
+from hrd import BitBoard, SearchStats, SolutionCache, bidirectional_BFS, read_from_file, \
+    solve
+
+#====================================================================================
+
+# Benchmarks the solvers on a corpus of puzzles and compares the results with
+# a stored baseline. Times and expansion rates depend on the machine, so the 
+# committed baseline only holds the status and length of each solution. With
+# --rates they are saved and compared as well, against a baseline saved with 
+# --rates on the same machine. Each run is repeated and its fastest repeat 
+# kept, and runs too short to time reliably are not compared on rate.
+
+# The puzzle corpus, one puzzle per file in a directory per difficulty. A 
+# puzzle's difficulty is set by the number of states astar expands on it:
+# easy below 15000, medium below 30000 and hard above, whatever the length
+# of its solution.
+default_corpus = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench')
+difficulties = ['easy', 'medium', 'hard']
+# The results that are the same on every machine, the only ones kept in a
+# baseline saved without --rates.
+portable = ('status', 'moves')
+# Searches that can be instrumented with SearchStats.
+instrumented = ('astar', 'dfs')
+# Runs with fewer expansions or seconds than this are too noisy for the
+# expansion rate check of diff().
+rate_min_expansions = 10000
+rate_min_seconds = 1.0
+
+
+def read_corpus(corpus):
+    """
+    List the puzzles of a corpus.
+
+    :param corpus: The corpus directory, with an easy, medium and hard
+        directory of puzzle files.
+    :type corpus: str
+    :return: The name and file name of each puzzle, easiest first.
+    :rtype: List[Tuple[str, str]]
+    """
+    puzzles = []
+    for difficulty in difficulties:
+        directory = os.path.join(corpus, difficulty)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith('.txt'):
+                name = '{}/{}'.format(difficulty, os.path.splitext(filename)[0])
+                puzzles.append((name, os.path.join(directory, filename)))
+    return puzzles
+
+
+def solve_options(algo, bitboard=True):
+    """
+    The options of hrd.solve() for a benchmark run.
+
+    :param algo: The --algo of hrd.py.
+    :type algo: str
+    :param bitboard: Whether to search on BitBoards.
+    :type bitboard: bool
+    :rtype: argparse.Namespace
+    """
+    return argparse.Namespace(algo=algo, bitboard=bitboard, heuristic='manhattan',
+        closed_limit=None, memory=1000000, jobs=None, compact=False, weight=3.0,
+        time_limit=None)
+
+
+def run_puzzle(filename, options, results):
+    """
+    Solve a puzzle in a benchmark process and put the result on a queue.
+
+    :param filename: The puzzle file.
+    :type filename: str
+    :param options: The options for hrd.solve().
+    :type options: argparse.Namespace
+    :param results: The queue to put the result on.
+    :type results: Queue
+    """
+    board = read_from_file(filename)
+    stats = SearchStats() if options.algo in instrumented else None
+    start = time.perf_counter()
+    a = solve(board, options, stats=stats)
+    elapsed = time.perf_counter() - start
+
+    result = {'status': 'solved' if a is not None else 'unsolved',
+        'moves': a.depth if a is not None else None, 'seconds': elapsed}
+    if stats is not None:
+        result['expanded'] = stats.expanded
+        result['expansions_per_second'] = stats.expanded / elapsed if elapsed else None
+    results.put(result)
+
+
+def benchmark(filename, algo, timeout, bitboard=True, repeats=1):
+    """
+    Solve a puzzle with one algorithm in a separate process, giving up after
+    a timeout, and keep the fastest of several repeats.
+
+    Expansion rates are measured with SearchStats, so they include its
+    overhead and are only comparable between runs of this benchmark.
+
+    :param filename: The puzzle file.
+    :type filename: str
+    :param algo: The --algo of hrd.py.
+    :type algo: str
+    :param timeout: The time limit in seconds.
+    :type timeout: float
+    :param bitboard: Whether to search on BitBoards.
+    :type bitboard: bool
+    :param repeats: The number of runs; a run that does not solve the 
+        puzzle ends the repeats.
+    :type repeats: int
+    :return: The status, number of moves, time and, for astar and dfs,
+        expansions of the fastest run.
+    :rtype: Dict[str, Any]
+    """
+    options = solve_options(algo, bitboard)
+    best = None
+    for _ in range(repeats):
+        results = Queue()
+        process = Process(target=run_puzzle, args=(filename, options, results))
+        process.start()
+        try:
+            result = results.get(timeout=timeout)
+        except Empty:
+            result = {'status': 'timeout' if process.is_alive() else 'error'}
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        if result['status'] != 'solved':
+            return result
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def diff(baseline, results, tolerance):
+    """
+    Compare benchmark results with a baseline.
+
+    A run regresses when it no longer solves its puzzle, finds a longer
+    solution or, given a tolerance, expands states more than tolerance 
+    slower. Rates are only compared when both runs took at least 
+    rate_min_expansions expansions and rate_min_seconds seconds.
+
+    :param baseline: The baseline results, see run_benchmarks().
+    :type baseline: Dict[str, Dict[str, Dict[str, Any]]]
+    :param results: The new results.
+    :type results: Dict[str, Dict[str, Dict[str, Any]]]
+    :param tolerance: The allowed slowdown, as a fraction, or None not to 
+        compare rates.
+    :type tolerance: Optional[float]
+    :return: A description of every regression.
+    :rtype: List[str]
+    """
+    def timed(run):
+        return bool(run.get('expansions_per_second')) \
+            and run.get('expanded', 0) >= rate_min_expansions \
+            and run.get('seconds', 0) >= rate_min_seconds
+
+    regressions = []
+    for name, runs in sorted(results.items()):
+        for algo, new in sorted(runs.items()):
+            old = baseline.get(name, {}).get(algo)
+            if old is None:
+                continue
+            label = '{} {}'.format(name, algo)
+            if old['status'] == 'solved' and new['status'] != 'solved':
+                regressions.append('{}: {} (was solved)'.format(label, new['status']))
+            elif old['status'] == 'solved' and new['moves'] > old['moves']:
+                regressions.append('{}: {} moves (was {})'.format(label, new['moves'],
+                    old['moves']))
+            elif tolerance is not None and timed(old) and timed(new) \
+                    and new['expansions_per_second'] < \
+                    old['expansions_per_second'] * (1 - tolerance):
+                regressions.append('{}: {:.0f} expansions/s (was {:.0f})'.format(label,
+                    new['expansions_per_second'], old['expansions_per_second']))
+    return regressions
+
+
+def check_cache(puzzles):
+    """
+    Solve every puzzle with astar twice against one solution cache, as it
+    fills and once it holds every solution, and compare the solution lengths
+    with bidirectional_BFS().
+
+    :param puzzles: The puzzles, see read_corpus().
+    :type puzzles: List[Tuple[str, str]]
+    :return: A description of every wrong solution length.
+    :rtype: List[str]
+    """
+    options = solve_options('astar')
+    mismatches = []
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SolutionCache(os.path.join(directory, 'cache.db'))
+        expected = {name: bidirectional_BFS(BitBoard.from_board(read_from_file(filename))) \
+            for name, filename in puzzles}
+        for run in ('cold', 'warm'):
+            for name, filename in puzzles:
+                a = solve(read_from_file(filename), options, cache=cache)
+                moves = a.depth if a is not None else None
+                shortest = expected[name].depth if expected[name] is not None else None
+                if moves != shortest:
+                    mismatches.append('{} ({} cache): {} moves (bibfs {})'.format(name,
+                        run, moves, shortest))
+        cache.close()
+    return mismatches
+
+
+def run_benchmarks(puzzles, algos, timeout, bitboard=True, repeats=1):
+    """
+    Benchmark every algorithm on every puzzle, printing a line per run.
+
+    :param puzzles: The puzzles, see read_corpus().
+    :type puzzles: List[Tuple[str, str]]
+    :param algos: The algorithms to run.
+    :type algos: List[str]
+    :param timeout: The time limit of each run in seconds.
+    :type timeout: float
+    :param bitboard: Whether to search on BitBoards.
+    :type bitboard: bool
+    :param repeats: The number of repeats of each run, see benchmark().
+    :type repeats: int
+    :return: The result of each run by puzzle name and algorithm.
+    :rtype: Dict[str, Dict[str, Dict[str, Any]]]
+    """
+    print('{:<28} {:<8} {:<8} {:>6} {:>9} {:>12}'.format('puzzle', 'algo', 'status',
+        'moves', 'seconds', 'expanded/s'))
+    results = {}
+    for name, filename in puzzles:
+        for algo in algos:
+            result = benchmark(filename, algo, timeout, bitboard, repeats)
+            results.setdefault(name, {})[algo] = result
+            print('{:<28} {:<8} {:<8} {:>6} {:>9} {:>12}'.format(name, algo,
+                result['status'],
+                result['moves'] if result.get('moves') is not None else '-',
+                '{:.3f}'.format(result['seconds']) if 'seconds' in result else '-',
+                '{:.0f}'.format(result['expansions_per_second']) \
+                    if result.get('expansions_per_second') else '-'))
+            sys.stdout.flush()
+    return results
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=default_corpus,
+        help="The puzzle corpus directory."
+    )
+    parser.add_argument(
+        "--algos",
+        nargs="+",
+        default=['astar', 'dfs', 'bibfs'],
+        choices=['astar', 'dfs', 'ida', 'iddfs', 'smastar', 'bibfs', 'hda', 'ara'],
+        help="The algorithms to benchmark."
+    )
+    parser.add_argument(
+        "--difficulty",
+        choices=difficulties,
+        help="Only benchmark the puzzles of this difficulty."
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60,
+        help="The time limit of each run in seconds."
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        help="Repeat each run this many times and keep the fastest; 3 with "
+            "--rates and 1 without by default."
+    )
+    parser.add_argument(
+        "--board",
+        action="store_true",
+        help="Search on Board instead of BitBoard."
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=os.path.join(default_corpus, 'baseline.json'),
+        help="The stored results to compare with."
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="The slowdown in expansions per second reported as a regression "
+            "with --rates."
+    )
+    parser.add_argument(
+        "--rates",
+        action="store_true",
+        help="Also save and compare times and expansion rates. They depend on "
+            "the machine, so compare only with a baseline saved with --rates "
+            "on the same machine."
+    )
+    parser.add_argument(
+        "--check-cache",
+        action="store_true",
+        help="Instead of benchmarking, check that astar with a solution cache "
+            "finds solutions as short as bibfs."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Also write the results as JSON to this file."
+    )
+    args = parser.parse_args()
+
+    puzzles = read_corpus(args.corpus)
+    if args.difficulty is not None:
+        puzzles = [(name, filename) for name, filename in puzzles \
+            if name.startswith(args.difficulty + '/')]
+
+    if args.check_cache:
+        mismatches = check_cache(puzzles)
+        print('{} wrong solution length(s) with a cache'.format(len(mismatches)))
+        for mismatch in mismatches:
+            print('  ' + mismatch)
+        sys.exit(1 if mismatches else 0)
+
+    if args.repeats is None:
+        args.repeats = 3 if args.rates else 1
+    results = run_benchmarks(puzzles, args.algos, args.timeout, not args.board,
+        args.repeats)
+
+    if args.output is not None:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=4, sort_keys=True)
+
+    if args.save_baseline:
+        if not args.rates:
+            results = {name: {algo: {field: result[field] for field in portable \
+                if field in result} for algo, result in runs.items()} \
+                for name, runs in results.items()}
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=4, sort_keys=True)
+        print('\nsaved baseline to {}'.format(args.baseline))
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = diff(json.load(baseline_file), results, 
+                args.tolerance if args.rates else None)
+        print('\n{} regression(s) against {}'.format(len(regressions), args.baseline))
+        for regression in regressions:
+            print('  ' + regression)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,214 @@
+import argparse
+import os
+import random
+import time
+
+from hrd import BitBoard, bidirectional_BFS, goal_layouts
+
+#====================================================================================
+
+# Generates random solvable puzzles with a given optimal solution length.
+#
+# Every puzzle is sampled from a breadth-first walk backwards from all the goal
+# layouts of a set of pieces. Moves are reversible, so a board first reached
+# on layer d of the walk is solvable in exactly d moves; solvability and depth
+# come with the walk, and the puzzles of a piece set are drawn from it at the
+# cost of a random choice each.
+
+
+def piece_sets(empty=2):
+    """
+    List the sets of pieces that fill the board with the goal piece and
+    leave some cells empty.
+
+    :param empty: The number of empty cells.
+    :type empty: int
+    :return: The numbers of horizontal, vertical and 1x1 pieces of each set.
+    :rtype: List[Tuple[int, int, int]]
+    """
+    free = 5 * 4 - 4 - empty
+    return [(horiz, vert, free - 2 * (horiz + vert)) \
+        for horiz in range(free // 2 + 1) for vert in range(free // 2 + 1 - horiz)]
+
+
+def reverse_layers(horiz, vert, singles, max_depth):
+    """
+    Walk breadth first backwards from every goal layout of a set of pieces.
+
+    Mirror images are walked once, by canonical key.
+
+    :param horiz: The number of horizontal 1x2 pieces.
+    :type horiz: int
+    :param vert: The number of vertical 1x2 pieces.
+    :type vert: int
+    :param singles: The number of 1x1 pieces.
+    :type singles: int
+    :param max_depth: The last layer to walk.
+    :type max_depth: int
+    :return: The canonical keys of the boards solvable in exactly d moves,
+        for d from 0 to max_depth or the last non-empty layer.
+    :rtype: List[List[int]]
+    """
+    seen = set()
+    layer = []
+    for goal in goal_layouts(horiz, vert, singles):
+        key = goal.canonical_key()
+        if key not in seen:
+            seen.add(key)
+            layer.append(key)
+
+    layers = [layer]
+    while layer and len(layers) <= max_depth:
+        next_layer = []
+        for key in layer:
+            for child, _ in BitBoard.from_key(key).successors():
+                child_key = child.canonical_key()
+                if child_key not in seen:
+                    seen.add(child_key)
+                    next_layer.append(child_key)
+        layer = next_layer
+        if layer:
+            layers.append(layer)
+    return layers
+
+
+def generate(count, min_depth, max_depth, pieces, rng=random, verify=False):
+    """
+    Generate distinct random puzzles solvable in min_depth to max_depth moves.
+
+    Each puzzle picks a piece set, a depth with boards of that set and a
+    board on that layer, mirrored half of the time.
+
+    :param count: The number of puzzles.
+    :type count: int
+    :param min_depth: The smallest optimal solution length.
+    :type min_depth: int
+    :param max_depth: The largest optimal solution length.
+    :type max_depth: int
+    :param pieces: The piece sets to draw from, see piece_sets().
+    :type pieces: List[Tuple[int, int, int]]
+    :param rng: The random number generator.
+    :type rng: random.Random
+    :param verify: Whether to solve every puzzle again with
+        bidirectional_BFS() and check its depth.
+    :type verify: bool
+    :return: A generator of puzzles and their optimal solution lengths,
+        fewer than count if the piece sets run out of boards.
+    :rtype: Iterator[Tuple[BitBoard, int]]
+    """
+    walks = {}
+    for piece_set in pieces:
+        layers = reverse_layers(*piece_set, max_depth)
+        walks[piece_set] = [(depth, layers[depth]) \
+            for depth in range(min_depth, len(layers))]
+    walks = {piece_set: depths for piece_set, depths in walks.items() if depths}
+
+    used = set()
+    available = sum(len(keys) for depths in walks.values() for _, keys in depths)
+    while count > 0 and len(used) < available:
+        depth, keys = rng.choice(walks[rng.choice(list(walks))])
+        key = rng.choice(keys)
+        if key in used:
+            continue
+        used.add(key)
+
+        board = BitBoard.from_key(key)
+        if rng.random() < 0.5:
+            board = board.mirror()
+        if verify:
+            solution = bidirectional_BFS(board)
+            if solution is None or solution.depth != depth:
+                raise AssertionError("{} is not solvable in {} moves".format(key,
+                    depth))
+        yield board, depth
+        count -= 1
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--count",
+        type=int,
+        required=True,
+        help="The number of puzzles to generate."
+    )
+    parser.add_argument(
+        "--min-depth",
+        type=int,
+        default=1,
+        help="The smallest optimal solution length."
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=1000,
+        help="The largest optimal solution length."
+    )
+    parser.add_argument(
+        "--pieces",
+        type=int,
+        nargs=3,
+        metavar=("HORIZ", "VERT", "SINGLES"),
+        help="The numbers of horizontal, vertical and 1x1 pieces, the classic "
+            "1 4 4 by default. Without --pieces and with --random-pieces, "
+            "every set leaving two cells empty is used."
+    )
+    parser.add_argument(
+        "--random-pieces",
+        action="store_true",
+        help="Draw the pieces of each puzzle from every set leaving two cells "
+            "empty."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="The random seed."
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Solve every puzzle again with the bidirectional BFS solver."
+    )
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument(
+        "--outputfile",
+        type=str,
+        help="Write the puzzles to this file, separated by blank lines."
+    )
+    output.add_argument(
+        "--outputdir",
+        type=str,
+        help="Write each puzzle to its own file in this directory."
+    )
+    args = parser.parse_args()
+
+    if args.pieces is not None:
+        if 4 + 2 * (args.pieces[0] + args.pieces[1]) + args.pieces[2] > 20:
+            parser.error("the pieces do not fit on the board")
+        pieces = [tuple(args.pieces)]
+    elif args.random_pieces:
+        pieces = piece_sets()
+    else:
+        pieces = [(1, 4, 4)]
+
+    start = time.time()
+    puzzles = list(generate(args.count, args.min_depth, args.max_depth, pieces,
+        random.Random(args.seed), args.verify))
+    if len(puzzles) < args.count:
+        print('only {} puzzles solvable in {} to {} moves'.format(len(puzzles),
+            args.min_depth, args.max_depth))
+
+    if args.outputfile is not None:
+        with open(args.outputfile, "w") as puzzle_file:
+            puzzle_file.write('\n'.join(board.to_board().display_string() + '\n' \
+                for board, _ in puzzles))
+    else:
+        os.makedirs(args.outputdir, exist_ok=True)
+        for i, (board, depth) in enumerate(puzzles):
+            filename = os.path.join(args.outputdir, 'puzzle_{}_{}.txt'.format(i + 1,
+                depth))
+            with open(filename, "w") as puzzle_file:
+                puzzle_file.write(board.to_board().display_string() + '\n')
+    print('{} puzzles generated in {:.1f}s'.format(len(puzzles), time.time() - start))
@@ -0,0 +1,789 @@
+import argparse
+import mmap
+import os
+import tempfile
+from heapq import merge
+
+from hrd import DFS, Heuristic, IDA_star, SMA_star, As_Man, State, get_solution, \
+    make_closed_set, output_to_file, read_from_lines
+
+#====================================================================================
+
+# A sliding block engine for any board size, piece shapes and exit.
+#
+# A puzzle file holds the start layout and, after a blank line, the goal:
+#
+#     LL.BC
+#     L..BC
+#     DEEFF
+#     D.GG.
+#
+#     .....
+#     .....
+#     ...LL
+#     ...L.
+#
+# (solvable in 32 moves)
+#
+# '.' is an empty cell and every other character draws a piece: the cells of
+# a piece are the 4-connected cells with its character, so pieces touching
+# each other need different characters. The goal layout marks the cells the
+# goal piece must cover, with its character. Pieces of the same shape and
+# character are interchangeable.
+#
+# A file of the 4x5 assignment format ('1', '2', '<>', '^v' and '.') without a
+# goal layout is read as the classic puzzle with the exit at the bottom middle.
+
+empty_char = '.'
+# The goal of the classic puzzle, the top left cell of the 2x2 piece.
+classic_exit = (1, 3)
+# Number of packed boards read from or written to a layer file at a time.
+file_block = 4096
+
+
+def shape_of(cells):
+    """
+    Normalize the cells of a piece to its bounding box.
+
+    :param cells: The x coordinate, y coordinate and symbol of each cell.
+    :type cells: List[Tuple[int, int, str]]
+    :return: The shape, as sorted offsets and symbols from the top left corner
+        of the bounding box, and that corner.
+    :rtype: Tuple[Tuple[Tuple[int, int, str], ...], Tuple[int, int]]
+    """
+    left = min(x for x, _, _ in cells)
+    top = min(y for _, y, _ in cells)
+    return tuple(sorted((x - left, y - top, ch) for x, y, ch in cells)), (left, top)
+
+
+class Puzzle:
+    """
+    The fixed part of a sliding block puzzle: the board size, the kinds of
+    pieces, the goal and the move tables shared by all of its boards.
+
+    Pieces are grouped by kind (shape and symbols), the goal piece alone in
+    group 0. A board stores the anchor (top left cell of the bounding box,
+    y * width + x) of every piece, group by group, sorted within a group.
+    For each kind, mask[a] is the cells covered at anchor a and steps[a] the
+    anchors one step away with the cells the piece has to move into, so a
+    move is checked with a single AND.
+    """
+
+    def __init__(self, width, height, kinds, counts, goal):
+        """
+        :param width: The number of columns.
+        :type width: int
+        :param height: The number of rows.
+        :type height: int
+        :param kinds: The shape of each group of pieces, the goal piece first.
+        :type kinds: List[Tuple[Tuple[int, int, str], ...]]
+        :param counts: The number of pieces in each group, 1 for the goal.
+        :type counts: List[int]
+        :param goal: The anchor of the goal piece in a solved board.
+        :type goal: int
+        """
+        self.width = width
+        self.height = height
+        self.kinds = kinds
+        self.counts = counts
+        self.goal = goal
+        size = width * height
+        self.bits = max(size - 1, 1).bit_length()
+
+        self.masks = []
+        self.steps = []
+        for kind in kinds:
+            span_x = max(dx for dx, _, _ in kind) + 1
+            span_y = max(dy for _, dy, _ in kind) + 1
+            masks = [None] * size
+            for y in range(height - span_y + 1):
+                for x in range(width - span_x + 1):
+                    masks[y * width + x] = sum(1 << ((y + dy) * width + x + dx) \
+                        for dx, dy, _ in kind)
+            steps = [[] for _ in range(size)]
+            for a in range(size):
+                if masks[a] is None:
+                    continue
+                x, y = a % width, a // width
+                for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+                    if 0 <= x + dx < width and 0 <= y + dy < height:
+                        b = a + dy * width + dx
+                        if masks[b] is not None:
+                            steps[a].append((b, masks[b] & ~masks[a]))
+            self.masks.append(masks)
+            self.steps.append(steps)
+
+        # group, first index and end index of every piece
+        self.groups = []
+        self.starts = []
+        start = 0
+        for group, count in enumerate(counts):
+            self.groups += [(group, start, start + count)] * count
+            self.starts.append(start)
+            start += count
+
+        self.mirror_groups = self.__find_mirror_groups()
+        if self.mirror_groups is not None:
+            self.mirror_anchors = [[self.mirror_anchor(group, a) \
+                if masks[a] is not None else None for a in range(size)] \
+                for group, masks in enumerate(self.masks)]
+
+
+    def __mirror_kind(self, kind):
+        span_x = max(dx for dx, _, _ in kind) + 1
+        return tuple(sorted((span_x - 1 - dx, dy, ch) for dx, dy, ch in kind))
+
+
+    def __find_mirror_groups(self):
+        """
+        Called in __init__ to match every group with the group of its mirror
+        image, when the puzzle is symmetric left to right.
+
+        :return: The mirror group of each group, or None.
+        :rtype: Optional[List[int]]
+        """
+        mirror_groups = []
+        for group, kind in enumerate(self.kinds):
+            shape = sorted((dx, dy) for dx, dy, _ in self.__mirror_kind(kind))
+            symbols = sorted(ch for _, _, ch in kind)
+            matches = [other for other, other_kind in enumerate(self.kinds) \
+                if sorted((dx, dy) for dx, dy, _ in other_kind) == shape \
+                and sorted(ch for _, _, ch in other_kind) == symbols \
+                and self.counts[other] == self.counts[group] \
+                and (other == 0) == (group == 0)]
+            if not matches:
+                return None
+            mirror_groups.append(matches[0])
+        if self.mirror_anchor(0, self.goal) != self.goal:
+            return None
+        return mirror_groups
+
+
+    def mirror_anchor(self, group, anchor):
+        """
+        The anchor of the mirror image of a piece.
+
+        :param group: The group of the piece.
+        :type group: int
+        :param anchor: The anchor of the piece.
+        :type anchor: int
+        :rtype: int
+        """
+        span_x = max(dx for dx, _, _ in self.kinds[group]) + 1
+        x, y = anchor % self.width, anchor // self.width
+        return y * self.width + self.width - span_x - x
+
+
+    def pack(self, anchors):
+        """
+        Pack the anchors of a board into an integer, see GeneralBoard.key().
+
+        :param anchors: The anchor of every piece, sorted within each group.
+        :type anchors: Sequence[int]
+        :rtype: int
+        """
+        bits = self.bits
+        key = 0
+        for anchor in reversed(anchors):
+            key = (key << bits) | anchor
+        return key
+
+
+    def board(self, anchors):
+        """
+        Create a board of this puzzle.
+
+        :param anchors: The anchor of every piece, in group order.
+        :type anchors: List[int]
+        :rtype: GeneralBoard
+        """
+        anchors = list(anchors)
+        occupied = 0
+        for i, (group, start, end) in enumerate(self.groups):
+            if i == start and end - start > 1:
+                anchors[start:end] = sorted(anchors[start:end])
+            occupied |= self.masks[group][anchors[i]]
+        return GeneralBoard(self, tuple(anchors), occupied)
+
+
+
+
+class GeneralBoard:
+    """
+    A board of a Puzzle, with the same interface as Board and BitBoard.
+    """
+
+    __slots__ = ('puzzle', 'anchors', 'occupied')
+
+    def __init__(self, puzzle, anchors, occupied):
+        """
+        :param puzzle: The puzzle of the board.
+        :type puzzle: Puzzle
+        :param anchors: The anchor of every piece, sorted within each group.
+        :type anchors: Tuple[int, ...]
+        :param occupied: The mask of the covered cells.
+        :type occupied: int
+        """
+        self.puzzle = puzzle
+        self.anchors = anchors
+        self.occupied = occupied
+
+
+    def display_string(self):
+        """
+        Return the current board as a string.
+        """
+        p = self.puzzle
+        grid = [empty_char] * (p.width * p.height)
+        for anchor, (group, _, _) in zip(self.anchors, p.groups):
+            for dx, dy, ch in p.kinds[group]:
+                grid[anchor + dy * p.width + dx] = ch
+        return '\n'.join(''.join(grid[y * p.width:(y + 1) * p.width]) \
+            for y in range(p.height))
+
+
+    def display(self):
+        """
+        Print out the current board.
+        """
+        print(self.display_string())
+
+
+    def findempty(self):
+        """
+        Find the empty cells on the board.
+
+        :return: The x and y coordinates of the empty cells, row by row.
+        :rtype: List[Tuple[int, int]]
+        """
+        p = self.puzzle
+        return [(cell % p.width, cell // p.width) for cell in range(p.width * p.height) \
+            if not self.occupied >> cell & 1]
+
+
+    def goal_check(self):
+        """
+        Check if the goal piece is on the exit.
+
+        :rtype: bool
+        """
+        return self.anchors[0] == self.puzzle.goal
+
+
+    def manhattan(self):
+        """
+        The Manhattan distance of the goal piece to the exit.
+
+        :rtype: int
+        """
+        w = self.puzzle.width
+        a, b = self.anchors[0], self.puzzle.goal
+        return abs(a % w - b % w) + abs(a // w - b // w)
+
+
+    def key(self):
+        """
+        Pack the anchors into an integer.
+
+        :rtype: int
+        """
+        return self.puzzle.pack(self.anchors)
+
+
+    @classmethod
+    def from_key(cls, puzzle, key):
+        """
+        Unpack a board of a puzzle, see key().
+
+        :rtype: GeneralBoard
+        """
+        mask = (1 << puzzle.bits) - 1
+        return puzzle.board([(key >> (i * puzzle.bits)) & mask \
+            for i in range(len(puzzle.groups))])
+
+
+    def mirror_anchors(self):
+        """
+        The anchors of the mirror image of the board, for a symmetric puzzle.
+
+        :rtype: List[int]
+        """
+        p = self.puzzle
+        anchors = [None] * len(self.anchors)
+        filled = list(p.starts)
+        for anchor, (group, _, _) in zip(self.anchors, p.groups):
+            other = p.mirror_groups[group]
+            anchors[filled[other]] = p.mirror_anchors[group][anchor]
+            filled[other] += 1
+        for start, count in zip(p.starts, p.counts):
+            if count > 1:
+                anchors[start:start + count] = sorted(anchors[start:start + count])
+        return anchors
+
+
+    def mirror(self):
+        """
+        Reflect the board left to right, for a symmetric puzzle.
+
+        :rtype: GeneralBoard
+        """
+        return self.puzzle.board(self.mirror_anchors())
+
+
+    def canonical_key(self):
+        """
+        Key shared by the board and its mirror image when the puzzle is
+        symmetric left to right, the plain key otherwise.
+
+        :rtype: int
+        """
+        if self.puzzle.mirror_groups is None:
+            return self.key()
+        return min(self.key(), self.puzzle.pack(self.mirror_anchors()))
+
+
+    def successors(self):
+        """
+        Generate every board reachable by moving one piece one step.
+
+        :return: A generator of successor boards and the moves reaching them,
+            as the group of the moved piece and its anchors before and after.
+        :rtype: Iterator[Tuple[GeneralBoard, Tuple[int, int, int]]]
+        """
+        p = self.puzzle
+        anchors = self.anchors
+        occupied = self.occupied
+        for i, anchor in enumerate(anchors):
+            group, start, end = p.groups[i]
+            masks = p.masks[group]
+            for b, gained in p.steps[group][anchor]:
+                if gained & occupied:
+                    continue
+                moved = list(anchors)
+                moved[i] = b
+                if end - start > 1:
+                    moved[start:end] = sorted(moved[start:end])
+                yield GeneralBoard(p, tuple(moved),
+                    occupied ^ masks[anchor] ^ masks[b]), (group, anchor, b)
+
+
+
+
+class GeneralManhattanHeuristic(Heuristic):
+    """
+    Manhattan distance of the goal piece to the exit, for GeneralBoard.
+    """
+
+    def evaluate(self, board):
+        return board.manhattan()
+
+    def update(self, h, board, move):
+        if move[0] != 0:
+            return h
+        return board.manhattan()
+
+
+
+def pieces_of(rows):
+    """
+    Find the pieces of a layout: the 4-connected cells with the same symbol.
+
+    :param rows: The rows of the layout.
+    :type rows: List[str]
+    :return: The cells of each piece, see shape_of().
+    :rtype: List[List[Tuple[int, int, str]]]
+    """
+    seen = set()
+    pieces = []
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row):
+            if ch == empty_char or (x, y) in seen:
+                continue
+            cells = []
+            stack = [(x, y)]
+            seen.add((x, y))
+            while stack:
+                cx, cy = stack.pop()
+                cells.append((cx, cy, ch))
+                for nx, ny in ((cx, cy - 1), (cx, cy + 1), (cx - 1, cy), (cx + 1, cy)):
+                    if 0 <= ny < len(rows) and 0 <= nx < len(rows[ny]) \
+                            and (nx, ny) not in seen and rows[ny][nx] == ch:
+                        seen.add((nx, ny))
+                        stack.append((nx, ny))
+            pieces.append(cells)
+    return pieces
+
+
+def read_general(filename):
+    """
+    Load a puzzle and its start board from a file, see the top of this file.
+
+    :param filename: The name of the given file.
+    :type filename: str
+    :return: The start board.
+    :rtype: GeneralBoard
+    :raises ValueError: If the file is not a valid puzzle.
+    """
+    blocks = [[]]
+    with open(filename, "r") as puzzle_file:
+        for line in puzzle_file:
+            line = line.rstrip('\n')
+            if line.startswith('#'):
+                continue
+            if line.strip():
+                blocks[-1].append(line)
+            elif blocks[-1]:
+                blocks.append([])
+    blocks = [block for block in blocks if block]
+    if not blocks:
+        raise ValueError("no layout in {}".format(filename))
+
+    rows = blocks[0]
+    width, height = len(rows[0]), len(rows)
+    if any(len(row) != width for row in rows):
+        raise ValueError("the rows of the layout have different lengths")
+
+    if len(blocks) == 1:
+        if (width, height) != (4, 5) or not set(''.join(rows)) <= set('12<>^v.'):
+            raise ValueError("a goal layout is needed for a non classic puzzle")
+        pieces = [piece.cells() for piece in read_from_lines(rows).pieces]
+        goal_index = next(i for i, piece in enumerate(pieces) \
+            if piece[0][2] == '1')
+        goal_cells = [(classic_exit[0] + dx, classic_exit[1] + dy) \
+            for dx in range(2) for dy in range(2)]
+    else:
+        goal_rows = blocks[1]
+        if len(goal_rows) != height or any(len(row) != width for row in goal_rows):
+            raise ValueError("the goal layout has a different size")
+        pieces = pieces_of(rows)
+        goal_cells = [(x, y) for y, row in enumerate(goal_rows) \
+            for x, ch in enumerate(row) if ch != empty_char]
+        symbols = set(goal_rows[y][x] for x, y in goal_cells)
+        if len(symbols) != 1:
+            raise ValueError("the goal layout must show one piece")
+        symbol = symbols.pop()
+        goal_shape = shape_of([(x, y, symbol) for x, y in goal_cells])[0]
+        goal_pieces = [i for i, piece in enumerate(pieces) \
+            if shape_of(piece)[0] == goal_shape]
+        if len(goal_pieces) != 1:
+            raise ValueError("the goal layout must match exactly one piece")
+        goal_index = goal_pieces[0]
+
+    # group the pieces by kind, the goal piece alone first
+    kinds = [shape_of(pieces[goal_index])[0]]
+    counts = [1]
+    anchors = [[shape_of(pieces[goal_index])[1]]]
+    for i, piece in enumerate(pieces):
+        if i == goal_index:
+            continue
+        kind, anchor = shape_of(piece)
+        if kind in kinds[1:]:
+            group = kinds.index(kind, 1)
+            counts[group] += 1
+            anchors[group].append(anchor)
+        else:
+            kinds.append(kind)
+            counts.append(1)
+            anchors.append([anchor])
+
+    goal_x = min(x for x, _ in goal_cells)
+    goal_y = min(y for _, y in goal_cells)
+    puzzle = Puzzle(width, height, kinds, counts, goal_y * width + goal_x)
+    return puzzle.board([y * width + x for group in anchors for x, y in group])
+
+
+def key_width(puzzle):
+    """
+    The number of bytes of a packed board of a puzzle in the files of 
+    external_BFS().
+
+    :type puzzle: Puzzle
+    :rtype: int
+    """
+    return (puzzle.bits * len(puzzle.groups) + 7) // 8
+
+
+def read_keys(filename, width):
+    """
+    Read the packed boards of a file of external_BFS() in file order.
+
+    :param filename: The layer or run file.
+    :type filename: str
+    :param width: The size of a packed board, see key_width().
+    :type width: int
+    :return: A generator of the packed boards.
+    :rtype: Iterator[bytes]
+    """
+    with open(filename, "rb") as key_file:
+        while True:
+            block = key_file.read(width * file_block)
+            if not block:
+                return
+            for i in range(0, len(block), width):
+                yield block[i:i + width]
+
+
+def write_keys(filename, keys):
+    """
+    Write packed boards to a file of external_BFS().
+
+    :param filename: The layer or run file.
+    :type filename: str
+    :param keys: The packed boards, in file order.
+    :type keys: Iterable[bytes]
+    :return: The number of boards written.
+    :rtype: int
+    """
+    written = 0
+    block = []
+    with open(filename, "wb") as key_file:
+        for key in keys:
+            block.append(key)
+            if len(block) == file_block:
+                key_file.write(b''.join(block))
+                written += len(block)
+                block = []
+        key_file.write(b''.join(block))
+    return written + len(block)
+
+
+def layer_contains(filename, width, key):
+    """
+    Binary search a layer file for a packed board.
+
+    :param filename: The layer file.
+    :type filename: str
+    :param width: The size of a packed board, see key_width().
+    :type width: int
+    :param key: The packed board.
+    :type key: bytes
+    :rtype: bool
+    """
+    with open(filename, "rb") as layer_file:
+        size = os.fstat(layer_file.fileno()).st_size // width
+        if not size:
+            return False
+        with mmap.mmap(layer_file.fileno(), 0, access=mmap.ACCESS_READ) as keys:
+            low, high = 0, size
+            while low < high:
+                middle = (low + high) // 2
+                if keys[middle * width:(middle + 1) * width] < key:
+                    low = middle + 1
+                else:
+                    high = middle
+            return low < size and keys[low * width:(low + 1) * width] == key
+
+
+def new_keys(runs, previous, width):
+    """
+    Merge the sorted runs of successors of a layer into the next layer, 
+    dropping repeated boards and the boards of the previous layers.
+
+    :param runs: The run files.
+    :type runs: List[str]
+    :param previous: The layer files whose boards are not new.
+    :type previous: List[str]
+    :param width: The size of a packed board, see key_width().
+    :type width: int
+    :return: A generator of the new packed boards, sorted.
+    :rtype: Iterator[bytes]
+    """
+    old = merge(*(read_keys(filename, width) for filename in previous))
+    old_key = next(old, None)
+    last = None
+    for key in merge(*(read_keys(filename, width) for filename in runs)):
+        if key == last:
+            continue
+        last = key
+        while old_key is not None and old_key < key:
+            old_key = next(old, None)
+        if key != old_key:
+            yield key
+
+
+def external_BFS(board, directory, memory=1000000, report=None, enumerate_all=False):
+    """
+    Breadth-first search keeping its layers on disk, for state spaces that
+    do not fit in memory.
+
+    Layer d is a file of the sorted, packed boards (big endian, key_width()
+    bytes each, so bytes order is key order) first reached in d moves. The
+    successors of a layer are sorted in memory runs of at most memory boards
+    and written out, then merged with the two previous layers to drop the 
+    boards already reached: moves are reversible, so a successor of layer d 
+    is in layer d - 1, d or d + 1. The solution is found backwards from the
+    goal, by binary searching each layer file for a neighbouring board.
+
+    With --symmetry, boards are packed by canonical key.
+
+    :param board: The start board.
+    :type board: GeneralBoard
+    :param directory: An existing directory for the layer and run files.
+    :type directory: str
+    :param memory: The most boards sorted in memory at a time.
+    :type memory: int
+    :param report: Called with the depth and size of each layer.
+    :type report: Optional[Callable[[int, int], None]]
+    :param enumerate_all: Whether to go on to the last layer after reaching 
+        the goal.
+    :type enumerate_all: bool
+    :return: A shortest solution state, or None if there is no solution.
+    :rtype: Optional[State]
+    """
+    puzzle = board.puzzle
+    width = key_width(puzzle)
+
+    def pack(b):
+        key = b.canonical_key() if State.symmetric else b.key()
+        return key.to_bytes(width, 'big')
+
+    def layer_file(depth):
+        return os.path.join(directory, 'layer_{}.bin'.format(depth))
+
+    def spill(keys, runs):
+        runs.append(os.path.join(directory, 'run_{}.bin'.format(len(runs))))
+        write_keys(runs[-1], sorted(set(keys)))
+
+    write_keys(layer_file(0), [pack(board)])
+    goal = goal_depth = None
+    depth = 0
+    size = 1
+    while True:
+        if report is not None:
+            report(depth, size)
+        runs = []
+        keys = []
+        for key in read_keys(layer_file(depth), width):
+            current = GeneralBoard.from_key(puzzle, int.from_bytes(key, 'big'))
+            if goal is None and current.goal_check():
+                goal, goal_depth = current, depth
+                if not enumerate_all:
+                    break
+            for child, _ in current.successors():
+                keys.append(pack(child))
+            if len(keys) >= memory:
+                spill(keys, runs)
+                keys = []
+        if goal is not None and not enumerate_all:
+            break
+        if keys:
+            spill(keys, runs)
+        previous = [layer_file(d) for d in (depth, depth - 1) if d >= 0]
+        size = write_keys(layer_file(depth + 1), new_keys(runs, previous, width))
+        for run in runs:
+            os.remove(run)
+        if not size:
+            os.remove(layer_file(depth + 1))
+            break
+        depth += 1
+
+    if goal is None:
+        return None
+    path = [goal]
+    for depth in range(goal_depth - 1, -1, -1):
+        path.append(next(child for child, _ in path[-1].successors() \
+            if layer_contains(layer_file(depth), width, pack(child))))
+    path.reverse()
+    if path[0].key() != board.key():
+        # reached from the mirror image of the start, and the goal is symmetric
+        path = [b.mirror() for b in path]
+
+    state = None
+    for depth, b in enumerate(path):
+        state = State(b, depth, depth, state)
+    return state
+
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--inputfile",
+        type=str,
+        required=True,
+        help="The input file that contains the puzzle."
+    )
+    parser.add_argument(
+        "--outputfile",
+        type=str,
+        required=True,
+        help="The output file that contains the solution."
+    )
+    parser.add_argument(
+        "--algo",
+        type=str,
+        required=True,
+        choices=['astar', 'dfs', 'ida', 'smastar', 'extbfs'],
+        help="The searching algorithm."
+    )
+    parser.add_argument(
+        "--symmetry",
+        action="store_true",
+        help="Treat mirror images as the same board, if the puzzle is symmetric."
+    )
+    parser.add_argument(
+        "--closed-limit",
+        type=int,
+        help="Bound the astar closed list to this many boards. Not for dfs, "
+            "which can loop forever between forgotten boards."
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        default=1000000,
+        help="The number of states ida and smastar may keep, or boards extbfs "
+            "sorts in memory at a time."
+    )
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        help="Keep the layer files of extbfs in this directory instead of a "
+            "temporary one."
+    )
+    parser.add_argument(
+        "--enumerate",
+        action="store_true",
+        help="Run extbfs to the last layer, printing the size of every layer."
+    )
+    args = parser.parse_args()
+    State.symmetric = args.symmetry
+    if args.closed_limit is not None and args.algo != 'astar':
+        parser.error("--closed-limit needs --algo astar")
+    if args.closed_limit is not None and args.closed_limit < 1:
+        parser.error("--closed-limit must be at least 1")
+    if args.memory < 1:
+        parser.error("--memory must be at least 1")
+
+    try:
+        board = read_general(args.inputfile)
+    except ValueError as e:
+        parser.error(str(e))
+    heuristic = GeneralManhattanHeuristic()
+
+    if args.algo == 'astar':
+        a = As_Man(State(board, 0, 0, None), make_closed_set(args.closed_limit),
+            heuristic)
+    elif args.algo == 'dfs':
+        a = DFS(State(board, 0, 0, None), make_closed_set(args.closed_limit))
+    elif args.algo == 'ida':
+        a = IDA_star(State(board, 0, 0, None), heuristic, args.memory)
+    elif args.algo == 'smastar':
+        a = SMA_star(State(board, 0, 0, None), heuristic, args.memory)
+    elif args.algo == 'extbfs':
+        def report(depth, size):
+            if args.enumerate:
+                print('layer {}: {} boards'.format(depth, size))
+
+        if args.workdir is not None:
+            os.makedirs(args.workdir, exist_ok=True)
+            a = external_BFS(board, args.workdir, args.memory, report, args.enumerate)
+        else:
+            with tempfile.TemporaryDirectory() as workdir:
+                a = external_BFS(board, workdir, args.memory, report, args.enumerate)
+
+    if a is None:
+        print('no solution')
+    else:
+        output_to_file(args.outputfile, get_solution(a))
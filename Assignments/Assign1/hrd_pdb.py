@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from hrd import BitBoard, build_pattern_database, read_from_file
+
+#====================================================================================
+
+# Builds the pattern database used by `hrd.py --pdb` for the pieces of a puzzle.
+# The database only depends on the number of horizontal and vertical 1x2 
+# pieces, so one file serves every puzzle with the same pieces.
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--inputfile",
+        type=str,
+        required=True,
+        help="A puzzle with the pieces to build the database for."
+    )
+    parser.add_argument(
+        "--pdbfile",
+        type=str,
+        required=True,
+        help="The output file for the pattern database."
+    )
+    args = parser.parse_args()
+
+    board = BitBoard.from_board(read_from_file(args.inputfile))
+    start = time.time()
+    pdb = build_pattern_database(bin(board.horiz).count('1'), 
+        bin(board.vert).count('1'))
+    pdb.save(args.pdbfile)
+    print('{} abstract boards, largest distance {}, built in {:.1f}s'.format(
+        len(pdb.table), pdb.unsolvable - 1, time.time() - start))
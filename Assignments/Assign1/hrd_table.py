@@ -0,0 +1,31 @@
+import argparse
+import time
+
+from hrd import build_distance_table, read_from_file
+
+#====================================================================================
+
+# Builds the distance table used by `hrd.py --table` for every board reachable
+# from a puzzle, so later runs on any of those boards are answered by lookup.
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--inputfile",
+        type=str,
+        required=True,
+        help="A puzzle whose reachable boards are enumerated."
+    )
+    parser.add_argument(
+        "--tablefile",
+        type=str,
+        required=True,
+        help="The output file for the distance table."
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    size, depth = build_distance_table(read_from_file(args.inputfile), args.tablefile)
+    print('{} boards, largest distance {}, built in {:.1f}s'.format(
+        size, depth, time.time() - start))